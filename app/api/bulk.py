@@ -0,0 +1,101 @@
+import json
+from typing import AsyncIterator, List, Tuple
+
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+
+from app.api.models import BookAPI, BulkRowError
+
+MAX_BULK_ROWS = 50_000
+# room for MAX_BULK_ROWS rows of about 650 bytes each
+MAX_BULK_BYTES = 32 * 1024 * 1024
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson")
+
+
+def _too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=detail)
+
+
+def _parse_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return e
+
+
+async def _read_chunks(request: Request) -> AsyncIterator[bytes]:
+    # refuses a declared or actual body over the cap before buffering it
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > MAX_BULK_BYTES:
+        raise _too_large(f"At most {MAX_BULK_BYTES} bytes per request")
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MAX_BULK_BYTES:
+            raise _too_large(f"At most {MAX_BULK_BYTES} bytes per request")
+        yield chunk
+
+
+async def _parse_ndjson(chunks: AsyncIterator[bytes]) -> List:
+    # one record per line, parsed as the lines arrive so an oversized batch is
+    # refused at row MAX_BULK_ROWS + 1 instead of after reading all of it
+    records = []
+    pending = bytearray()
+    async for chunk in chunks:
+        pending += chunk
+        end = pending.rfind(b"\n")
+        if end == -1:
+            continue
+        for line in pending[:end].split(b"\n"):
+            if line.strip():
+                records.append(_parse_line(line))
+        del pending[: end + 1]
+        if len(records) > MAX_BULK_ROWS:
+            raise _too_large(f"At most {MAX_BULK_ROWS} books per request")
+    if pending.strip():
+        records.append(_parse_line(pending))
+    return records
+
+
+async def read_bulk_payload(request: Request) -> List:
+    chunks = _read_chunks(request)
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith(NDJSON_MEDIA_TYPES):
+        records = await _parse_ndjson(chunks)
+    else:
+        body = b"".join([chunk async for chunk in chunks])
+        try:
+            records = json.loads(body)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if not isinstance(records, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Expected a JSON array of books",
+            )
+    if len(records) > MAX_BULK_ROWS:
+        raise _too_large(f"At most {MAX_BULK_ROWS} books per request")
+    return records
+
+
+def validate_bulk_payload(
+    records: List,
+) -> Tuple[List[int], List[BookAPI], List[BulkRowError]]:
+    indexes, books, errors = [], [], []
+    for index, record in enumerate(records):
+        if isinstance(record, ValueError):
+            errors.append(BulkRowError(index=index, detail=str(record)))
+            continue
+        try:
+            books.append(BookAPI.model_validate(record))
+        except ValidationError as e:
+            errors.append(
+                BulkRowError(
+                    index=index,
+                    id=record.get("id") if isinstance(record, dict) else None,
+                    detail=e.errors(include_url=False, include_context=False),
+                )
+            )
+            continue
+        indexes.append(index)
+    return indexes, books, errors
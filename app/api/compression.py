@@ -0,0 +1,91 @@
+import gzip
+from typing import Callable, Dict, Hashable, Tuple
+
+from fastapi import Request, Response
+
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
+
+try:
+    import zstandard
+except ImportError:  # optional, gzip is always available
+    zstandard = None
+
+IDENTITY = "identity"
+# responses whose body depends on the negotiated coding
+VARY_ENCODING = "Accept-Encoding"
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+SNAPSHOT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def snapshot_size(snapshot: Tuple[bytes, Dict[str, str]]) -> int:
+    # weight of a stored snapshot, headers are negligible next to the body
+    return len(snapshot[0])
+
+
+def _gzip(body: bytes) -> bytes:
+    # mtime=0 keeps the output identical for identical input
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {"gzip": _gzip}
+if zstandard is not None:
+    COMPRESSORS["zstd"] = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+
+# preferred first when the client accepts several with the same quality
+ENCODING_PREFERENCE = ("zstd", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str:
+    if not accept_encoding:
+        return IDENTITY
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = IDENTITY, 0.0
+    for coding in ENCODING_PREFERENCE:
+        quality = qualities.get(coding, wildcard)
+        if coding in COMPRESSORS and quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def request_encoding(request: Request) -> str:
+    return negotiate_encoding(request.headers.get("accept-encoding"))
+
+
+def snapshot_response(
+    snapshots: LRUTTLCache,
+    key: Hashable,
+    encoding: str,
+    build: Callable[[], Response],
+) -> Response:
+    # key must change with the catalog version, so a snapshot is compressed
+    # once per catalog change and then served as stored bytes
+    if encoding == IDENTITY:
+        response = build()
+        response.headers["Vary"] = VARY_ENCODING
+        return response
+    snapshot = snapshots.get(key)
+    if snapshot is None:
+        response = build()
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name != "content-length"
+        }
+        headers["Content-Encoding"] = encoding
+        headers["Vary"] = VARY_ENCODING
+        snapshot = (COMPRESSORS[encoding](response.body), headers)
+        if len(snapshot[0]) <= SNAPSHOT_MAX_BYTES:
+            snapshots.set(key, snapshot)
+    body, headers = snapshot
+    return Response(content=body, headers=headers)
@@ -1,17 +1,115 @@
 from fastapi import Depends
 from app.domain.repositories.book_repository_protocol import BookRepositoryProtocol
+from app.domain.repositories.async_book_repository_protocol import (
+    AsyncBookRepositoryProtocol,
+)
 from app.application.services.book_service import BookService
+from app.application.services.async_book_service import AsyncBookService
+from app.api.compression import snapshot_size
+from app.config import settings
+from app.infrastructure.cache.cache_metrics import register_cache_metrics
+from app.infrastructure.cache.catalog_version import CatalogVersion, catalog_version
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
+from app.infrastructure.index.catalog_index import CatalogIndex
 from app.infrastructure.repositories.sqlalchemy_book_repository import (
     SQLAlchemyBookRepository,
 )
-from app.infrastructure.database.session import get_db
+from app.infrastructure.repositories.async_sqlalchemy_book_repository import (
+    AsyncSQLAlchemyBookRepository,
+)
+from app.infrastructure.repositories.caching_book_repository import (
+    CachingBookRepository,
+)
+from app.infrastructure.repositories.indexed_book_repository import (
+    IndexedBookRepository,
+)
+from app.infrastructure.repositories.timed_book_repository import (
+    TimedBookRepository,
+)
+from app.infrastructure.repositories.async_caching_book_repository import (
+    AsyncCachingBookRepository,
+)
+from app.infrastructure.database.session import get_db, get_async_db
+from app.infrastructure.metrics.app_metrics import metrics_registry
+
+BOOK_CACHE_MAXSIZE = 10_000
+BOOK_CACHE_TTL_SECONDS = 60.0
+FILTER_CACHE_MAXSIZE = 1_000
+FILTER_CACHE_TTL_SECONDS = 300.0
+SNAPSHOT_CACHE_MAXSIZE = 32
+# the memory budget for compressed snapshots per process; one snapshot may
+# take up to SNAPSHOT_MAX_BYTES of it
+SNAPSHOT_CACHE_MAX_BYTES = 128 * 1024 * 1024
+SNAPSHOT_CACHE_TTL_SECONDS = 3600.0
+
+# shared by the sync and async paths so writes on one invalidate reads on the other
+book_cache = LRUTTLCache(maxsize=BOOK_CACHE_MAXSIZE, ttl=BOOK_CACHE_TTL_SECONDS)
+filter_cache = LRUTTLCache(maxsize=FILTER_CACHE_MAXSIZE, ttl=FILTER_CACHE_TTL_SECONDS)
+# compressed list responses keyed by catalog version, so only hot ones survive
+snapshot_cache = LRUTTLCache(
+    maxsize=SNAPSHOT_CACHE_MAXSIZE,
+    ttl=SNAPSHOT_CACHE_TTL_SECONDS,
+    max_weight=SNAPSHOT_CACHE_MAX_BYTES,
+    weigh=snapshot_size,
+)
+register_cache_metrics(
+    metrics_registry,
+    {"book": book_cache, "filter": filter_cache, "snapshot": snapshot_cache},
+)
+catalog_index = CatalogIndex() if settings.catalog_index_enabled else None
+
+
+def get_book_cache() -> LRUTTLCache:
+    return book_cache
 
 
-def get_book_repository(db=Depends(get_db)) -> BookRepositoryProtocol:
-    return SQLAlchemyBookRepository(db)
+def get_filter_cache() -> LRUTTLCache:
+    return filter_cache
+
+
+def get_snapshot_cache() -> LRUTTLCache:
+    return snapshot_cache
+
+
+def get_catalog_version() -> CatalogVersion:
+    return catalog_version
+
+
+def get_catalog_index() -> CatalogIndex | None:
+    return catalog_index
+
+
+def get_book_repository(
+    db=Depends(get_db),
+    cache: LRUTTLCache = Depends(get_book_cache),
+    results_cache: LRUTTLCache = Depends(get_filter_cache),
+    index: CatalogIndex | None = Depends(get_catalog_index),
+) -> BookRepositoryProtocol:
+    repository: BookRepositoryProtocol = TimedBookRepository(
+        SQLAlchemyBookRepository(db)
+    )
+    if index is not None:
+        repository = IndexedBookRepository(repository, index)
+    return CachingBookRepository(repository, cache, results_cache)
 
 
 def get_book_service(
     repo: BookRepositoryProtocol = Depends(get_book_repository),
 ) -> BookService:
     return BookService(repo)
+
+
+def get_async_book_repository(
+    db=Depends(get_async_db),
+    cache: LRUTTLCache = Depends(get_book_cache),
+    results_cache: LRUTTLCache = Depends(get_filter_cache),
+) -> AsyncBookRepositoryProtocol:
+    return AsyncCachingBookRepository(
+        TimedBookRepository(AsyncSQLAlchemyBookRepository(db)), cache, results_cache
+    )
+
+
+def get_async_book_service(
+    repo: AsyncBookRepositoryProtocol = Depends(get_async_book_repository),
+) -> AsyncBookService:
+    return AsyncBookService(repo)
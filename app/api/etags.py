@@ -0,0 +1,44 @@
+import uuid
+
+from fastapi import Request, Response, status
+
+from app.infrastructure.cache.catalog_version import CatalogVersion
+
+# versions restart at 0 with the process, the epoch keeps old tags from matching
+ETAG_EPOCH = uuid.uuid4().hex[:12]
+CACHE_CONTROL = "no-cache"
+
+
+def catalog_etag(version: CatalogVersion, encoding: str = "identity") -> str:
+    # each content coding is a different representation and needs its own tag
+    suffix = "" if encoding == "identity" else f"-{encoding}"
+    return f'"{ETAG_EPOCH}-{version.value}{suffix}"'
+
+
+def book_etag(version: CatalogVersion, book_id: int) -> str:
+    return f'"{ETAG_EPOCH}-{book_id}-{version.row_version(book_id)}"'
+
+
+def etag_matches(request: Request, etag: str, wildcard: bool = True) -> bool:
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    # If-None-Match uses the weak comparison
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    # "*" only matches when a current representation exists, callers that
+    # don't know that yet pass wildcard=False
+    return (wildcard and "*" in candidates) or etag in candidates
+
+
+def not_modified(etag: str, vary: str | None = None) -> Response:
+    # a 304 has to repeat the Vary of the 200 it stands for, or a shared cache
+    # may pair it with another representation
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if vary is not None:
+        headers["Vary"] = vary
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import Iterable, Iterator
+
+from app.domain.entities.book import BookEntity
+
+EXPORT_FIELDS = ("id", "title", "author", "pages", "rating", "price")
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def iter_ndjson(books: Iterable[BookEntity], chunk_rows: int = 500) -> Iterator[str]:
+    lines = []
+    for book in books:
+        lines.append(json.dumps(book.to_dict(), separators=(",", ":")))
+        if len(lines) >= chunk_rows:
+            lines.append("")
+            yield "\n".join(lines)
+            lines = []
+    if lines:
+        lines.append("")
+        yield "\n".join(lines)
+
+
+def iter_csv(books: Iterable[BookEntity], chunk_rows: int = 500) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    # send the header right away so the client gets the first byte immediately
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    rows = 0
+    for book in books:
+        writer.writerow([getattr(book, field) for field in EXPORT_FIELDS])
+        rows += 1
+        if rows >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if rows:
+        yield buffer.getvalue()
+
+
+ENCODERS = {
+    ExportFormat.ndjson: iter_ndjson,
+    ExportFormat.csv: iter_csv,
+}
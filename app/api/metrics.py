@@ -0,0 +1,51 @@
+import time
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+
+from app.api.profiling import ProfiledRoute
+from app.infrastructure.metrics.app_metrics import (
+    REQUEST_LATENCY,
+    REQUEST_SQL_DURATION,
+    REQUEST_SQL_QUERIES,
+    REQUESTS_IN_FLIGHT,
+)
+from app.infrastructure.log.queue_logging import current_route
+from app.infrastructure.metrics.sql_tracking import track_queries
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class InstrumentedRoute(ProfiledRoute):
+    # labels use the path template, so /books/{book_id} is one series, not one per id
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path_format
+
+        async def instrumented_handler(request: Request) -> Response:
+            method = request.method
+            status = 500
+            REQUESTS_IN_FLIGHT.inc(method, route)
+            route_token = current_route.set(f"{method} {route}")
+            start = time.perf_counter()
+            with track_queries() as queries:
+                try:
+                    response = await handler(request)
+                    status = response.status_code
+                    return response
+                except HTTPException as e:
+                    status = e.status_code
+                    raise
+                except RequestValidationError:
+                    status = 422
+                    raise
+                finally:
+                    elapsed = time.perf_counter() - start
+                    REQUESTS_IN_FLIGHT.dec(method, route)
+                    current_route.reset(route_token)
+                    REQUEST_LATENCY.observe(method, route, str(status), value=elapsed)
+                    REQUEST_SQL_QUERIES.observe(method, route, value=queries.count)
+                    REQUEST_SQL_DURATION.observe(method, route, value=queries.duration)
+
+        return instrumented_handler
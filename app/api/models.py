@@ -1,6 +1,15 @@
-from typing import Annotated, Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from app.domain.entities.book import MAX_PRICE
+from app.domain.entities.book_batch import BOOK_FIELDS
+
+SORT_KEYS = ("price", "rating", "pages", "title")
+_SORT_KEY = f"-?(?:{'|'.join(SORT_KEYS)})"
+SORT_PATTERN = f"^{_SORT_KEY}(?:,{_SORT_KEY})*$"
+_FIELD = f"(?:{'|'.join(BOOK_FIELDS)})"
+FIELDS_PATTERN = f"^{_FIELD}(?:,{_FIELD})*$"
 
 
 class BookAPI(BaseModel):
@@ -9,7 +18,7 @@ class BookAPI(BaseModel):
     author: Annotated[str, Field(min_length=1)]
     pages: Annotated[int, Field(ge=0)]
     rating: Annotated[float, Field(ge=0, le=5)]
-    price: Annotated[float, Field(ge=0, le=9999.99)]
+    price: Annotated[float, Field(ge=0, le=MAX_PRICE)]
 
     model_config = {"from_attributes": True}
 
@@ -30,12 +39,31 @@ class BookAPI(BaseModel):
 
 class BookFilter(BaseModel):
     title: Optional[str] = None
+    search_mode: Literal["substring", "fulltext"] = "substring"
     min_pages: Optional[int] = Field(None, ge=0)
     max_pages: Optional[int] = Field(None, ge=0)
     min_rating: Optional[float] = Field(None, ge=0, le=5)
     max_rating: Optional[float] = Field(None, ge=0, le=5)
     min_price: Optional[float] = Field(None, ge=0)
     max_price: Optional[float] = Field(None, ge=0)
+    # comma-separated keys, "-" for descending: sort=-rating,price
+    sort: Optional[str] = Field(None, pattern=SORT_PATTERN)
+
+
+class PageParams(BaseModel):
+    limit: Optional[int] = Field(None, gt=0, le=1000)
+    cursor: Optional[str] = None
+
+
+class FieldSelection(BaseModel):
+    # sparse fieldset, comma-separated: fields=price,rating; id is always included
+    fields: Optional[str] = Field(None, pattern=FIELDS_PATTERN)
+
+    def selected(self) -> Tuple[str, ...] | None:
+        if self.fields is None:
+            return None
+        requested = set(self.fields.split(","))
+        return tuple(name for name in BOOK_FIELDS if name == "id" or name in requested)
 
 
 class BookUpdate(BaseModel):
@@ -43,4 +71,118 @@ class BookUpdate(BaseModel):
     author: Annotated[Optional[str], Field(min_length=1)] = None
     pages: Annotated[Optional[int], Field(ge=0)] = None
     rating: Annotated[Optional[float], Field(ge=0, le=5)] = None
-    price: Annotated[Optional[float], Field(ge=0, le=9999.99)] = None
+    price: Annotated[Optional[float], Field(ge=0, le=MAX_PRICE)] = None
+
+
+class BulkRowError(BaseModel):
+    index: int
+    id: Optional[int] = None
+    detail: Any
+
+
+class BulkInsertResult(BaseModel):
+    inserted: int
+    ids: List[int]
+    conflicts: List[BulkRowError]
+    errors: List[BulkRowError]
+
+
+MAX_BATCH_IDS = 10_000
+
+
+class BatchGetRequest(BaseModel):
+    ids: Annotated[List[int], Field(min_length=1, max_length=MAX_BATCH_IDS)]
+
+
+class BatchGetResult(BaseModel):
+    books: List[BookAPI]
+    missing: List[int]
+
+
+class PriceAdjustment(BaseModel):
+    mode: Literal["percent", "absolute", "set"]
+    value: float
+    round_to: Optional[float] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def check_set_price(self):
+        # relative adjustments are clamped per row, a fixed price must fit as is
+        if self.mode == "set" and not 0 <= self.value <= MAX_PRICE:
+            raise ValueError(f"set price must be between 0 and {MAX_PRICE}")
+        return self
+
+
+# filter fields that don't narrow the set of rows
+NON_NARROWING_FILTERS = {"search_mode", "sort"}
+# bounds at or past these admit every valid value of the column
+RANGE_LIMITS = {"pages": (0, None), "rating": (0, 5), "price": (0, MAX_PRICE)}
+
+
+def narrows(name: str, value: Any) -> bool:
+    if name in NON_NARROWING_FILTERS:
+        return False
+    if name == "title":
+        # a blank title is a substring of every title
+        return bool(value.strip())
+    bound, column = name.split("_", 1)
+    low, high = RANGE_LIMITS[column]
+    if bound == "min":
+        return value > low
+    return high is None or value < high
+
+
+class RepriceRequest(BaseModel):
+    filter: BookFilter = BookFilter()
+    adjustment: PriceAdjustment
+    return_rows: bool = False
+    # repricing the whole catalog has to be asked for explicitly
+    all: bool = False
+
+    @model_validator(mode="after")
+    def check_scope(self):
+        predicates = self.filter.model_dump(exclude_none=True)
+        if not self.all and not any(
+            narrows(name, value) for name, value in predicates.items()
+        ):
+            raise ValueError("the filter matches every book, set all to true")
+        return self
+
+
+class RepriceResult(BaseModel):
+    updated: int
+    books: Optional[List[BookAPI]] = None
+
+
+class StatisticsParams(BaseModel):
+    buckets: int = Field(10, ge=1, le=100)
+    top_authors: int = Field(10, ge=0, le=1000)
+
+
+class ColumnStatistics(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+    percentiles: Dict[str, Optional[float]]
+
+
+class HistogramBucket(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+
+class AuthorStatistics(BaseModel):
+    author: str
+    count: int
+    avg_price: Optional[float] = None
+    avg_rating: Optional[float] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+
+class BookStatistics(BaseModel):
+    count: int
+    price: ColumnStatistics
+    rating: ColumnStatistics
+    price_histogram: List[HistogramBucket]
+    authors: List[AuthorStatistics]
@@ -0,0 +1,45 @@
+import base64
+import binascii
+import json
+from typing import Sequence, Tuple
+
+from app.domain.entities.book import BookEntity
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    def __init__(self, cursor: str):
+        super().__init__(f"Invalid pagination cursor: {cursor}")
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(last_id, int):
+        raise InvalidCursor(cursor)
+    return last_id
+
+
+def fetch_limit(limit: int | None) -> int | None:
+    # one extra row tells us whether another page exists
+    return None if limit is None else limit + 1
+
+
+def split_page(
+    books: Sequence[BookEntity], limit: int | None
+) -> Tuple[Sequence[BookEntity], str | None]:
+    if limit is None or len(books) <= limit:
+        return books, None
+    page = books[:limit]
+    return page, encode_cursor(page[-1].id)
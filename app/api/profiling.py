@@ -0,0 +1,112 @@
+import functools
+import hmac
+import inspect
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Callable
+
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.profiling.profilers import (
+    PROFILERS,
+    profile_current_thread,
+    profiled_threads,
+)
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_FILE_HEADER = "X-Profile-File"
+
+logger = logging.getLogger(__name__)
+
+
+def _profile_name(scope: Scope, suffix: str) -> str:
+    path = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    return f"{stamp}-{scope['method']}-{path}-{uuid.uuid4().hex[:8]}.{suffix}"
+
+
+class ProfiledRoute(APIRoute):
+    # sync endpoints run on a threadpool worker, which joins the profile of the
+    # request it serves so the sampler looks at it too
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if not inspect.iscoroutinefunction(endpoint):
+            sync_endpoint = endpoint
+
+            @functools.wraps(sync_endpoint)
+            def endpoint(*call_args, **call_kwargs):
+                profile_current_thread()
+                return sync_endpoint(*call_args, **call_kwargs)
+
+        super().__init__(path, endpoint, **kwargs)
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str,
+        token: str | None = None,
+        sample_rate: float = 0.0,
+        profile_format: str = "collapsed",
+        interval: float = 0.005,
+    ):
+        self.app = app
+        self.directory = directory
+        self.token = token
+        self.sample_rate = sample_rate
+        self.profiler_class = PROFILERS[profile_format]
+        self.interval = interval
+        # the interpreter allows a single active profiler, so profile one
+        # request at a time and let concurrent ones through untouched
+        self._busy = threading.Lock()
+
+    def _wanted(self, scope: Scope) -> bool:
+        if self.token is not None:
+            supplied = Headers(scope=scope).get(PROFILE_TOKEN_HEADER)
+            if supplied is not None and hmac.compare_digest(supplied, self.token):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        # the event loop thread, plus the threadpool workers that join in
+        threads = {threading.get_ident()}
+        profiler = self.profiler_class(interval=self.interval, threads=threads)
+        name = _profile_name(scope, profiler.suffix)
+
+        async def send_with_profile_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_FILE_HEADER] = name
+            await send(message)
+
+        try:
+            threads_token = profiled_threads.set(threads)
+            profiler.start()
+            try:
+                await self.app(scope, receive, send_with_profile_header)
+            finally:
+                profiler.stop()
+                profiled_threads.reset(threads_token)
+        finally:
+            self._busy.release()
+        await run_in_threadpool(self._write, profiler, name)
+
+    def _write(self, profiler, name: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        profiler.write(path)
+        logger.info("[PROFILE] Wrote %s", path)
@@ -0,0 +1,41 @@
+from typing import Iterable, Sequence
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+
+
+def json_books_response(
+    books: BookBatch, fields: Sequence[str] | None = None
+) -> Response:
+    # rows come straight from the database columns, encode them without
+    # building BookAPI models or re-validating against the response_model
+    return Response(
+        content=to_json(books.to_dicts(fields)), media_type="application/json"
+    )
+
+
+def json_book_response(book: BookEntity, fields: Sequence[str]) -> Response:
+    return Response(
+        content=to_json({name: getattr(book, name) for name in fields}),
+        media_type="application/json",
+    )
+
+
+def json_batch_response(books: BookBatch, requested_ids: Iterable[int]) -> Response:
+    found = set(books.ids)
+    missing = [
+        book_id for book_id in dict.fromkeys(requested_ids) if book_id not in found
+    ]
+    return Response(
+        content=to_json({"books": books.to_dicts(), "missing": missing}),
+        media_type="application/json",
+    )
+
+
+def json_statistics_response(statistics: BaseModel) -> Response:
+    # built by hand so the bytes can be compressed once and stored as a snapshot
+    return Response(content=to_json(statistics), media_type="application/json")
@@ -1,22 +1,84 @@
 import logging
-import random
 from typing import List
 
-from fastapi import routing, Depends, status, HTTPException
+from fastapi import routing, Depends, status, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
-from app.api.dependencies import get_book_service
+from app.api.dependencies import (
+    get_book_service,
+    get_async_book_service,
+    get_catalog_version,
+    get_snapshot_cache,
+)
 from app.application.services.book_service import BookService
+from app.application.services.async_book_service import AsyncBookService
 from app.domain.entities.book import BookEntity
 from app.domain.exceptions import DatabaseError, BookAlreadyExists, BookDoesntExist
-from app.api.models import BookAPI, BookUpdate, BookFilter
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
+from app.infrastructure.cache.catalog_version import CatalogVersion
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
+from app.api.bulk import read_bulk_payload, validate_bulk_payload
+from app.api.compression import VARY_ENCODING, request_encoding, snapshot_response
+from app.api.etags import (
+    book_etag,
+    catalog_etag,
+    etag_matches,
+    not_modified,
+    set_etag,
+)
+from app.api.export import ENCODERS, MEDIA_TYPES, ExportFormat
+from app.api.models import (
+    BookAPI,
+    BookUpdate,
+    BookFilter,
+    PageParams,
+    FieldSelection,
+    StatisticsParams,
+    BookStatistics,
+    BatchGetRequest,
+    BatchGetResult,
+    BulkInsertResult,
+    BulkRowError,
+    RepriceRequest,
+    RepriceResult,
+)
+from app.api.metrics import InstrumentedRoute
+from app.infrastructure.log.queue_logging import BookSummary
+from app.api.responses import (
+    json_batch_response,
+    json_book_response,
+    json_books_response,
+    json_statistics_response,
+)
+from app.infrastructure.database.pool_metrics import pool_stats
+from app.infrastructure.database.session import engine, async_engine
+from app.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    InvalidCursor,
+    decode_cursor,
+    fetch_limit,
+    split_page,
 )
+
 logger = logging.getLogger(__name__)
 
-router = routing.APIRouter()
+router = routing.APIRouter(route_class=InstrumentedRoute)
+
+
+def _decode_page_cursor(page: PageParams) -> int | None:
+    try:
+        return decode_cursor(page.cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def _snapshot_key(request: Request, etag: str) -> tuple:
+    # the etag carries the catalog version and the content coding
+    return etag, request.url.path, tuple(sorted(request.query_params.multi_items()))
 
 
 @router.get("/health", status_code=status.HTTP_200_OK)
@@ -24,15 +86,98 @@ def check_health():
     return {"status": "ok"}
 
 
+@router.get("/health/pool", status_code=status.HTTP_200_OK)
+def check_pool():
+    return {"sync": pool_stats(engine), "async": pool_stats(async_engine.sync_engine)}
+
+
 @router.get(
     "/",
     status_code=status.HTTP_200_OK,
     response_model=List[BookAPI],
 )
-def get_all_books(service: BookService = Depends(get_book_service)):
-    books = service.get_all_books()
-    books = [BookAPI.model_validate(book.to_dict()) for book in books]
-    return books
+def get_all_books(
+    request: Request,
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(),
+    service: BookService = Depends(get_book_service),
+    version: CatalogVersion = Depends(get_catalog_version),
+    snapshots: LRUTTLCache = Depends(get_snapshot_cache),
+):
+    encoding = request_encoding(request)
+    # read before querying, so a concurrent write can only make the tag older
+    etag = catalog_etag(version, encoding)
+    if etag_matches(request, etag):
+        return not_modified(etag, vary=VARY_ENCODING)
+    after_id = _decode_page_cursor(page)
+    fields = fieldset.selected()
+
+    def build_response():
+        books = service.get_all_books(
+            limit=fetch_limit(page.limit), after_id=after_id, fields=fields
+        )
+        books, next_cursor = split_page(books, page.limit)
+        response = json_books_response(books, fields)
+        _set_next_cursor(response, next_cursor)
+        set_etag(response, etag)
+        return response
+
+    return snapshot_response(
+        snapshots, _snapshot_key(request, etag), encoding, build_response
+    )
+
+
+@router.get(
+    "/books/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+def export_books(
+    format: ExportFormat = ExportFormat.ndjson,
+    filters: BookFilter = Depends(),
+    service: BookService = Depends(get_book_service),
+):
+    books = service.stream_books(**filters.model_dump(exclude_unset=True))
+    return StreamingResponse(
+        ENCODERS[format](books),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="books.{format.value}"'},
+    )
+
+
+@router.get(
+    "/books/stats",
+    status_code=status.HTTP_200_OK,
+    response_model=BookStatistics,
+)
+def get_book_statistics(
+    request: Request,
+    filters: BookFilter = Depends(),
+    params: StatisticsParams = Depends(),
+    service: BookService = Depends(get_book_service),
+    version: CatalogVersion = Depends(get_catalog_version),
+    snapshots: LRUTTLCache = Depends(get_snapshot_cache),
+):
+    encoding = request_encoding(request)
+    etag = catalog_etag(version, encoding)
+    if etag_matches(request, etag):
+        return not_modified(etag, vary=VARY_ENCODING)
+
+    def build_response():
+        statistics = service.get_book_statistics(
+            buckets=params.buckets,
+            top_authors=params.top_authors,
+            # ordering has no effect on aggregates, keep it out of the cache key
+            **filters.model_dump(exclude_unset=True, exclude={"sort"}),
+        )
+        logger.info("[GET] Statistics over %d books", statistics["count"])
+        response = json_statistics_response(BookStatistics.model_validate(statistics))
+        set_etag(response, etag)
+        return response
+
+    return snapshot_response(
+        snapshots, _snapshot_key(request, etag), encoding, build_response
+    )
 
 
 @router.get(
@@ -41,15 +186,32 @@ def get_all_books(service: BookService = Depends(get_book_service)):
     response_model=BookAPI,
 )
 async def get_book_by_id(
-    book_id: int, service: BookService = Depends(get_book_service)
+    book_id: int,
+    request: Request,
+    response: Response,
+    fieldset: FieldSelection = Depends(),
+    service: AsyncBookService = Depends(get_async_book_service),
+    version: CatalogVersion = Depends(get_catalog_version),
 ):
+    etag = book_etag(version, book_id)
+    # a missing book has no representation for "*" to match, it's a 404
+    if etag_matches(request, etag, wildcard=False):
+        return not_modified(etag)
     try:
-        book = service.get_book_by_id(book_id)
-        book = BookAPI.model_validate(book.to_dict())
-        logger.info(f"[GET] Book retrieved by id: {book}")
-        return book
+        book = await service.get_book_by_id(book_id)
     except BookDoesntExist as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    logger.info("[GET] Book retrieved by id: %s", book_id)
+    fields = fieldset.selected()
+    if fields is not None:
+        # the whole row comes from the row cache, only the output is trimmed
+        projected = json_book_response(book, fields)
+        set_etag(projected, etag)
+        return projected
+    set_etag(response, etag)
+    return BookAPI.model_validate(book.to_dict())
 
 
 @router.get(
@@ -58,14 +220,47 @@ async def get_book_by_id(
     response_model=List[BookAPI] | None,
 )
 def filter_books(
+    request: Request,
     filters: BookFilter = Depends(),
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(),
     service: BookService = Depends(get_book_service),
+    version: CatalogVersion = Depends(get_catalog_version),
+    snapshots: LRUTTLCache = Depends(get_snapshot_cache),
 ):
+    # sorted and relevance-ordered results have no id-based seek position
+    id_ordered = filters.sort is None and filters.search_mode != "fulltext"
+    if not id_ordered and page.cursor is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is only supported for results ordered by id",
+        )
+    encoding = request_encoding(request)
+    etag = catalog_etag(version, encoding)
+    if etag_matches(request, etag):
+        return not_modified(etag, vary=VARY_ENCODING)
+    after_id = _decode_page_cursor(page)
     filter_data = filters.model_dump(exclude_unset=True)
-    filtered_books = service.filter_books(**filter_data)
-    books = [BookAPI.model_validate(book.to_dict()) for book in filtered_books]
-    logging.info(f"[GET] Filtered books: {books}")
-    return books
+    fields = fieldset.selected()
+
+    def build_response():
+        books = service.filter_books(
+            limit=fetch_limit(page.limit),
+            after_id=after_id,
+            fields=fields,
+            **filter_data,
+        )
+        books, next_cursor = split_page(books, page.limit)
+        response = json_books_response(books, fields)
+        if id_ordered:
+            _set_next_cursor(response, next_cursor)
+        set_etag(response, etag)
+        logger.info("[GET] Filtered books: %s", BookSummary(books))
+        return response
+
+    return snapshot_response(
+        snapshots, _snapshot_key(request, etag), encoding, build_response
+    )
 
 
 @router.post(
@@ -74,8 +269,6 @@ def filter_books(
     response_model=BookAPI,
 )
 def add_book(book: BookAPI, service: BookService = Depends(get_book_service)):
-    if not book.id:
-        book.id = random.randint(1000, 9999)
     try:
         book: BookEntity = service.add_book(book.model_dump())
     except BookAlreadyExists as e:
@@ -84,10 +277,80 @@ def add_book(book: BookAPI, service: BookService = Depends(get_book_service)):
         raise HTTPException(status_code=500, detail=str(e))
 
     book: BookAPI = BookAPI.model_validate(book.to_dict())
-    logger.info(f"[POST] Book created {book}")
+    logger.info("[POST] Book created with id %s", book.id)
     return book
 
 
+@router.post(
+    "/books/batch-get",
+    status_code=status.HTTP_200_OK,
+    response_model=BatchGetResult,
+)
+def get_books_by_ids(
+    batch: BatchGetRequest,
+    service: BookService = Depends(get_book_service),
+):
+    books = service.get_books_by_ids(batch.ids)
+    logger.info("[POST] Batch get for %d ids: %s", len(batch.ids), BookSummary(books))
+    return json_batch_response(books, batch.ids)
+
+
+@router.post(
+    "/books/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkInsertResult,
+)
+def add_books(
+    records: list = Depends(read_bulk_payload),
+    service: BookService = Depends(get_book_service),
+):
+    indexes, books, errors = validate_bulk_payload(records)
+    results = service.add_books([book.model_dump() for book in books])
+
+    ids, conflicts = [], []
+    for index, book, result in zip(indexes, books, results):
+        if isinstance(result, BookAlreadyExists):
+            conflicts.append(BulkRowError(index=index, id=book.id, detail=str(result)))
+        elif isinstance(result, Exception):
+            errors.append(BulkRowError(index=index, id=book.id, detail=str(result)))
+        else:
+            ids.append(result)
+    errors.sort(key=lambda error: error.index)
+    logger.info(
+        "[POST] Bulk insert: %d inserted, %d conflicts, %d errors",
+        len(ids),
+        len(conflicts),
+        len(errors),
+    )
+    return BulkInsertResult(
+        inserted=len(ids), ids=ids, conflicts=conflicts, errors=errors
+    )
+
+
+@router.post(
+    "/books/reprice",
+    status_code=status.HTTP_200_OK,
+    response_model=RepriceResult,
+    response_model_exclude_none=True,
+)
+def reprice_books(
+    reprice: RepriceRequest,
+    service: BookService = Depends(get_book_service),
+):
+    try:
+        count, books = service.reprice_books(
+            reprice.adjustment.model_dump(),
+            return_rows=reprice.return_rows,
+            **reprice.filter.model_dump(exclude_unset=True),
+        )
+    except DatabaseError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    logger.info("[POST] Repriced %d books with %s", count, reprice.adjustment)
+    if books is not None:
+        books = [BookAPI.model_validate(book.to_dict()) for book in books]
+    return RepriceResult(updated=count, books=books)
+
+
 @router.put(
     "/books/{book_id}",
     status_code=status.HTTP_200_OK,
@@ -114,7 +377,7 @@ def update_book(
             detail=str(e),
         )
     updated_book = BookAPI.model_validate(book.to_dict())
-    logger.info(f"[PUT] Updated book: {updated_book}")
+    logger.info("[PUT] Updated book with id %s", book_id)
     return updated_book
 
 
@@ -135,4 +398,4 @@ def delete_book(book_id: int, service: BookService = Depends(get_book_service)):
             status_code=500,
             detail=str(e),
         )
-    logger.info(f"[DELETE] Deleted book with id {book_id}")
+    logger.info("[DELETE] Deleted book with id %s", book_id)
@@ -0,0 +1,11 @@
+from fastapi import routing, Response
+
+from app.api.metrics import METRICS_CONTENT_TYPE
+from app.infrastructure.metrics.app_metrics import metrics_registry
+
+router = routing.APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return Response(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
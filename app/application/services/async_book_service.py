@@ -0,0 +1,52 @@
+from typing import AsyncIterator, List, Sequence
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+from app.domain.repositories.async_book_repository_protocol import (
+    AsyncBookRepositoryProtocol,
+)
+from app.domain.services.async_book_service_protocol import AsyncBookServiceProtocol
+
+
+class AsyncBookService(AsyncBookServiceProtocol):
+    def __init__(self, book_repository: AsyncBookRepositoryProtocol):
+        self.book_repository = book_repository
+
+    async def get_all_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> BookBatch:
+        return await self.book_repository.get_all_books(
+            limit=limit, after_id=after_id, fields=fields
+        )
+
+    async def get_book_by_id(self, book_id: int) -> BookEntity:
+        return await self.book_repository.get_book_by_id(book_id)
+
+    async def filter_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+        **filters,
+    ) -> BookBatch:
+        return await self.book_repository.filter_books(
+            limit=limit, after_id=after_id, fields=fields, **filters
+        )
+
+    def stream_books(
+        self, batch_size: int = 1000, **filters
+    ) -> AsyncIterator[BookEntity]:
+        return self.book_repository.stream_books(batch_size=batch_size, **filters)
+
+    async def add_book(self, book_add_data: dict) -> BookEntity:
+        book = BookEntity(**book_add_data)
+        return await self.book_repository.add_book(book)
+
+    async def update_book(self, book_id: int, book_update_data: dict) -> BookEntity:
+        return await self.book_repository.update_book(book_id, book_update_data)
+
+    async def delete_book(self, book_id) -> None:
+        await self.book_repository.delete_book(book_id)
@@ -1,6 +1,7 @@
-from typing import List
+from typing import Iterator, List, Sequence, Tuple
 
 from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
 from app.domain.repositories.book_repository_protocol import BookRepositoryProtocol
 from app.domain.services.book_service_protocol import BookServiceProtocol
 
@@ -9,21 +10,60 @@ class BookService(BookServiceProtocol):
     def __init__(self, book_repository: BookRepositoryProtocol):
         self.book_repository = book_repository
 
-    def get_all_books(self) -> List[BookEntity] | None:
-        return self.book_repository.get_all_books()
+    def get_all_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> BookBatch:
+        return self.book_repository.get_all_books(
+            limit=limit, after_id=after_id, fields=fields
+        )
 
     def get_book_by_id(self, book_id: int) -> BookEntity:
         return self.book_repository.get_book_by_id(book_id)
 
-    def filter_books(self, **filters) -> List[BookEntity] | None:
-        return self.book_repository.filter_books(**filters)
+    def get_books_by_ids(self, book_ids: Sequence[int]) -> BookBatch:
+        return self.book_repository.get_books_by_ids(book_ids)
+
+    def filter_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+        **filters,
+    ) -> BookBatch:
+        return self.book_repository.filter_books(
+            limit=limit, after_id=after_id, fields=fields, **filters
+        )
+
+    def stream_books(self, batch_size: int = 1000, **filters) -> Iterator[BookEntity]:
+        return self.book_repository.stream_books(batch_size=batch_size, **filters)
+
+    def get_book_statistics(
+        self, buckets: int = 10, top_authors: int = 10, **filters
+    ) -> dict:
+        return self.book_repository.get_book_statistics(
+            buckets=buckets, top_authors=top_authors, **filters
+        )
 
     def add_book(self, book_add_data: dict) -> BookEntity:
         book = BookEntity(**book_add_data)
         return self.book_repository.add_book(book)
 
+    def add_books(self, books_add_data: List[dict]) -> List[int | Exception]:
+        books = [BookEntity(**book_add_data) for book_add_data in books_add_data]
+        return self.book_repository.add_books(books)
+
     def update_book(self, book_id: int, book_update_data: dict) -> BookEntity:
         return self.book_repository.update_book(book_id, book_update_data)
 
+    def reprice_books(
+        self, adjustment: dict, return_rows: bool = False, **filters
+    ) -> Tuple[int, List[BookEntity] | None]:
+        return self.book_repository.reprice_books(
+            adjustment, return_rows=return_rows, **filters
+        )
+
     def delete_book(self, book_id) -> None:
         self.book_repository.delete_book(book_id)
@@ -0,0 +1,97 @@
+import os
+from dataclasses import dataclass
+
+from sqlalchemy.engine import make_url
+
+DEFAULT_DATABASE_URL = "postgresql://postgres:secret@db:5432/mydb"
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return default if value is None else int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return default if value is None else float(value)
+
+
+def _normalize_url(url: str) -> str:
+    # SQLAlchemy 2 no longer accepts the postgres:// alias most platforms hand out
+    if url.startswith("postgres://"):
+        return "postgresql://" + url[len("postgres://") :]
+    return url
+
+
+def _async_url(url: str) -> str:
+    # same database, async driver; backends without a known one are kept as is
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: str = DEFAULT_DATABASE_URL
+    async_database_url: str = _async_url(DEFAULT_DATABASE_URL)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 500
+    catalog_index_enabled: bool = False
+    profile_dir: str = "profiles"
+    profile_token: str | None = None
+    profile_sample_rate: float = 0.0
+    profile_format: str = "collapsed"
+    profile_interval: float = 0.005
+    log_level: str = "INFO"
+    log_sample_rate: float = 1.0
+    log_route_sample_rates: str = ""
+
+    @property
+    def profiling_enabled(self) -> bool:
+        return self.profile_token is not None or self.profile_sample_rate > 0
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        database_url = _normalize_url(os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL))
+        return cls(
+            database_url=database_url,
+            async_database_url=_normalize_url(
+                os.getenv("ASYNC_DATABASE_URL", _async_url(database_url))
+            ),
+            db_pool_size=_env_int("DB_POOL_SIZE", cls.db_pool_size),
+            db_max_overflow=_env_int("DB_MAX_OVERFLOW", cls.db_max_overflow),
+            db_pool_timeout=_env_float("DB_POOL_TIMEOUT", cls.db_pool_timeout),
+            db_pool_recycle=_env_int("DB_POOL_RECYCLE", cls.db_pool_recycle),
+            db_pool_pre_ping=_env_flag("DB_POOL_PRE_PING", cls.db_pool_pre_ping),
+            db_statement_cache_size=_env_int(
+                "DB_STATEMENT_CACHE_SIZE", cls.db_statement_cache_size
+            ),
+            catalog_index_enabled=_env_flag("CATALOG_INDEX_ENABLED"),
+            profile_dir=os.getenv("PROFILE_DIR", cls.profile_dir),
+            profile_token=os.getenv("PROFILE_TOKEN") or None,
+            profile_sample_rate=_env_float(
+                "PROFILE_SAMPLE_RATE", cls.profile_sample_rate
+            ),
+            profile_format=os.getenv("PROFILE_FORMAT", cls.profile_format),
+            profile_interval=_env_float("PROFILE_INTERVAL", cls.profile_interval),
+            log_level=os.getenv("LOG_LEVEL", cls.log_level),
+            log_sample_rate=_env_float("LOG_SAMPLE_RATE", cls.log_sample_rate),
+            log_route_sample_rates=os.getenv(
+                "LOG_ROUTE_SAMPLE_RATES", cls.log_route_sample_rates
+            ),
+        )
+
+
+settings = Settings.from_env()
@@ -1,4 +1,9 @@
+MAX_PRICE = 9999.99
+
+
 class BookEntity:
+    __slots__ = ("id", "title", "author", "pages", "price", "rating")
+
     def __init__(
         self,
         id: int,
@@ -16,7 +21,11 @@ class BookEntity:
         self.rating = rating
 
     def to_dict(self):
-        return {k: v for k, v in vars(self).items() if v is not None}
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        }
 
     def __repr__(self):
         return (
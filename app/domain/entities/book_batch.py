@@ -0,0 +1,161 @@
+import math
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Sequence
+
+from app.domain.entities.book import BookEntity
+
+# arrays can't hold None, pages are never negative and prices/ratings never NaN
+MISSING_INT = -1
+MISSING_FLOAT = math.nan
+
+# column order of the rows a batch is built from and of its JSON objects
+BOOK_FIELDS = ("id", "title", "author", "pages", "rating", "price")
+
+
+def _intern(value: str | None) -> str | None:
+    return None if value is None else sys.intern(value)
+
+
+def _int_or_none(value: int) -> int | None:
+    return None if value == MISSING_INT else value
+
+
+def _float_or_none(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+class BookBatch:
+    __slots__ = ("ids", "titles", "authors", "pages", "ratings", "prices")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.titles: List[str] = []
+        self.authors: List[str] = []
+        self.pages = array("q")
+        self.ratings = array("d")
+        self.prices = array("d")
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Sequence], fields: Sequence[str] | None = None
+    ) -> "BookBatch":
+        # rows in the order of fields, columns that were not selected stay None
+        batch = cls()
+        if fields is None or tuple(fields) == BOOK_FIELDS:
+            for book_id, title, author, pages, rating, price in rows:
+                batch.append(book_id, title, author, pages, rating, price)
+            return batch
+        empty = dict.fromkeys(BOOK_FIELDS)
+        for row in rows:
+            batch.append(**{**empty, **dict(zip(fields, row))})
+        return batch
+
+    @classmethod
+    def from_entities(cls, books: Iterable[BookEntity]) -> "BookBatch":
+        batch = cls()
+        for book in books:
+            batch.append(
+                book.id, book.title, book.author, book.pages, book.rating, book.price
+            )
+        return batch
+
+    def append(
+        self,
+        id: int,
+        title: str,
+        author: str,
+        pages: int | None,
+        rating: float | None,
+        price: float | None,
+    ) -> None:
+        self.ids.append(id)
+        self.titles.append(_intern(title))
+        self.authors.append(_intern(author))
+        self.pages.append(MISSING_INT if pages is None else pages)
+        self.ratings.append(MISSING_FLOAT if rating is None else rating)
+        self.prices.append(MISSING_FLOAT if price is None else price)
+
+    def entity(self, index: int) -> BookEntity:
+        return BookEntity(
+            id=self.ids[index],
+            title=self.titles[index],
+            author=self.authors[index],
+            pages=_int_or_none(self.pages[index]),
+            price=_float_or_none(self.prices[index]),
+            rating=_float_or_none(self.ratings[index]),
+        )
+
+    def to_dicts(self, fields: Sequence[str] | None = None) -> List[dict]:
+        if fields is not None and tuple(fields) != BOOK_FIELDS:
+            columns = [self._column(name) for name in fields]
+            return [dict(zip(fields, values)) for values in zip(*columns)]
+        return [
+            {
+                "id": book_id,
+                "title": title,
+                "author": author,
+                "pages": _int_or_none(pages),
+                "rating": _float_or_none(rating),
+                "price": _float_or_none(price),
+            }
+            for book_id, title, author, pages, rating, price in zip(
+                self.ids,
+                self.titles,
+                self.authors,
+                self.pages,
+                self.ratings,
+                self.prices,
+            )
+        ]
+
+    def _column(self, name: str) -> Iterable:
+        if name == "id":
+            return self.ids
+        if name == "title":
+            return self.titles
+        if name == "author":
+            return self.authors
+        if name == "pages":
+            return map(_int_or_none, self.pages)
+        if name == "rating":
+            return map(_float_or_none, self.ratings)
+        if name == "price":
+            return map(_float_or_none, self.prices)
+        raise KeyError(name)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            batch = BookBatch()
+            batch.ids = self.ids[index]
+            batch.titles = self.titles[index]
+            batch.authors = self.authors[index]
+            batch.pages = self.pages[index]
+            batch.ratings = self.ratings[index]
+            batch.prices = self.prices[index]
+            return batch
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("BookBatch index out of range")
+        return self.entity(index)
+
+    def __iter__(self) -> Iterator[BookEntity]:
+        for index in range(len(self)):
+            yield self.entity(index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, BookBatch):
+            return self.to_dicts() == other.to_dicts()
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(
+                book.to_dict() == other_book.to_dict()
+                for book, other_book in zip(self, other)
+            )
+        return NotImplemented
+
+    def __repr__(self):
+        return f"<BookBatch(rows={len(self)})>"
@@ -0,0 +1,33 @@
+from typing import AsyncIterator, Protocol, List, Sequence
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+
+
+class AsyncBookServiceProtocol(Protocol):
+    async def get_all_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> BookBatch: ...
+
+    async def get_book_by_id(self, book_id: int) -> BookEntity: ...
+
+    async def filter_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+        **filters,
+    ) -> BookBatch: ...
+
+    def stream_books(
+        self, batch_size: int = 1000, **filters
+    ) -> AsyncIterator[BookEntity]: ...
+
+    async def add_book(self, book_add_data: dict) -> BookEntity: ...
+
+    async def update_book(self, book_id: int, book_update_data: dict) -> BookEntity: ...
+
+    async def delete_book(self, book_id) -> None: ...
@@ -1,17 +1,45 @@
-from typing import Protocol, List
+from typing import Iterator, Protocol, List, Sequence, Tuple
 
 from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
 
 
 class BookServiceProtocol(Protocol):
-    def get_all_books(self) -> List[BookEntity] | None: ...
+    def get_all_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> BookBatch: ...
 
     def get_book_by_id(self, book_id: int) -> BookEntity: ...
 
-    def filter_books(self, **filters) -> List[BookEntity] | None: ...
+    def get_books_by_ids(self, book_ids: Sequence[int]) -> BookBatch: ...
+
+    def filter_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+        **filters,
+    ) -> BookBatch: ...
+
+    def stream_books(
+        self, batch_size: int = 1000, **filters
+    ) -> Iterator[BookEntity]: ...
+
+    def get_book_statistics(
+        self, buckets: int = 10, top_authors: int = 10, **filters
+    ) -> dict: ...
 
     def add_book(self, book_add_data: dict) -> BookEntity: ...
 
+    def add_books(self, books_add_data: List[dict]) -> List[int | Exception]: ...
+
     def update_book(self, book_id: int, book_update_data: dict) -> BookEntity: ...
 
+    def reprice_books(
+        self, adjustment: dict, return_rows: bool = False, **filters
+    ) -> Tuple[int, List[BookEntity] | None]: ...
+
     def delete_book(self, book_id) -> None: ...
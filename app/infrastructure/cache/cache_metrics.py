@@ -0,0 +1,36 @@
+from typing import Dict
+
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
+from app.infrastructure.metrics.registry import (
+    CallbackCounter,
+    CallbackGauge,
+    MetricsRegistry,
+)
+
+
+def register_cache_metrics(registry: MetricsRegistry, caches: Dict[str, LRUTTLCache]):
+    def stat(key: str):
+        return lambda: {(name,): cache.stats()[key] for name, cache in caches.items()}
+
+    registry.register(
+        CallbackGauge(
+            "cache_entries", "Entries held by cache", ("cache",), stat("size")
+        )
+    )
+    registry.register(
+        CallbackGauge(
+            "cache_weight",
+            "Summed weight of the entries, bytes for the snapshot cache",
+            ("cache",),
+            stat("weight"),
+        )
+    )
+    for key, documentation in (
+        ("hits", "Cache lookups that found a live entry"),
+        ("misses", "Cache lookups that found nothing or an expired entry"),
+        ("evictions", "Entries dropped to make room for new ones"),
+        ("expirations", "Entries dropped because their TTL ran out"),
+    ):
+        registry.register(
+            CallbackCounter(f"cache_{key}", documentation, ("cache",), stat(key))
+        )
@@ -0,0 +1,43 @@
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+MAX_TRACKED_ROWS = 100_000
+
+
+class CatalogVersion:
+    def __init__(self, max_tracked_rows: int = MAX_TRACKED_ROWS):
+        self._value = 0
+        self._lock = threading.Lock()
+        # version at which each recently written row last changed; rows that
+        # were never written or fell out of the map are at the floor
+        self._rows: OrderedDict = OrderedDict()
+        self._floor = 0
+        self.max_tracked_rows = max_tracked_rows
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self, book_ids: Iterable[int] | None = None) -> int:
+        # without ids every row counts as changed
+        with self._lock:
+            self._value += 1
+            if book_ids is None:
+                self._floor = self._value
+                self._rows.clear()
+                return self._value
+            for book_id in book_ids:
+                self._rows[book_id] = self._value
+                self._rows.move_to_end(book_id)
+            while len(self._rows) > self.max_tracked_rows:
+                _, evicted = self._rows.popitem(last=False)
+                self._floor = max(self._floor, evicted)
+            return self._value
+
+    def row_version(self, book_id: int) -> int:
+        return max(self._rows.get(book_id, 0), self._floor)
+
+
+# process-wide; bumped by every repository write path
+catalog_version = CatalogVersion()
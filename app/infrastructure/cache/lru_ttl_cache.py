@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+_MISSING = object()
+
+
+class LRUTTLCache:
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        max_weight: float | None = None,
+        weigh: Callable[[Any], float] | None = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # optional second bound on the summed weight of the entries, for
+        # values whose size varies too much for an entry count to cap memory
+        self.max_weight = max_weight
+        self._weigh = weigh or (lambda value: 1)
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.weight = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _pop(self, key: Hashable) -> None:
+        # callers hold the lock
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.weight -= entry[2]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value, _ = entry
+            if expires_at <= self._clock():
+                self._pop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        weight = self._weigh(value)
+        with self._lock:
+            self._pop(key)
+            if self.max_weight is not None and weight > self.max_weight:
+                # would flush everything else and still not fit
+                return
+            self._data[key] = (self._clock() + self.ttl, value, weight)
+            self.weight += weight
+            while len(self._data) > self.maxsize or (
+                self.max_weight is not None and self.weight > self.max_weight
+            ):
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.weight = 0.0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "weight": self.weight,
+            "max_weight": self.max_weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
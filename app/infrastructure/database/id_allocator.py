@@ -0,0 +1,21 @@
+from sqlalchemy import text
+
+# explicit ids bypass the sequence, move it past them so it never hands them out
+ADVANCE_SEQUENCE = text(
+    "SELECT setval(pg_get_serial_sequence('books', 'id'), GREATEST(:book_id, "
+    "COALESCE(pg_sequence_last_value(pg_get_serial_sequence('books', 'id')), 0)))"
+)
+
+
+class SequenceIdAllocator:
+    dialects = ("postgresql",)
+
+    def supports(self, session) -> bool:
+        return session.get_bind().dialect.name in self.dialects
+
+    def advance_past(self, session, book_id: int) -> None:
+        session.execute(ADVANCE_SEQUENCE, {"book_id": book_id})
+
+
+# process-wide, shared by every request's repository
+book_id_allocator = SequenceIdAllocator()
@@ -0,0 +1,86 @@
+import argparse
+import logging
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+
+from app.infrastructure.database.migrations import (
+    v0001_create_books,
+    v0002_title_search,
+    v0003_range_indexes,
+    v0004_sync_id_sequence,
+    v0005_sort_key_indexes,
+)
+
+logger = logging.getLogger(__name__)
+
+# migrations must be idempotent: databases created from init.sql already
+# contain the objects but have no schema_migrations rows
+MIGRATIONS = [
+    v0001_create_books,
+    v0002_title_search,
+    v0003_range_indexes,
+    v0004_sync_id_sequence,
+    v0005_sort_key_indexes,
+]
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def applied_versions(engine) -> set[int]:
+    with engine.begin() as connection:
+        schema_migrations.create(connection, checkfirst=True)
+        return set(connection.scalars(select(schema_migrations.c.version)))
+
+
+def migrate(engine, target: int | None = None) -> List[int]:
+    applied = applied_versions(engine)
+    newly_applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.VERSION):
+        if migration.VERSION in applied:
+            continue
+        if target is not None and migration.VERSION > target:
+            break
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(
+                schema_migrations.insert().values(
+                    version=migration.VERSION,
+                    description=migration.DESCRIPTION,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+        logger.info(
+            "Applied migration %s: %s", migration.VERSION, migration.DESCRIPTION
+        )
+        newly_applied.append(migration.VERSION)
+    return newly_applied
+
+
+def main():
+    from app.infrastructure.database.session import engine
+
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument("--target", type=int, default=None)
+    parser.add_argument("--list", action="store_true", help="show applied versions")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.list:
+        applied = applied_versions(engine)
+        for migration in MIGRATIONS:
+            state = "applied" if migration.VERSION in applied else "pending"
+            print(f"{migration.VERSION:04d} {state:<8} {migration.DESCRIPTION}")
+        return
+    migrate(engine, target=args.target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    Integer,
+    MetaData,
+    Numeric,
+    Table,
+    Text,
+)
+
+VERSION = 1
+DESCRIPTION = "create books table"
+
+# frozen copy of the schema at this version, mirrors init.sql
+books = Table(
+    "books",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("title", Text, nullable=False),
+    Column("author", Text, nullable=False),
+    Column("pages", Integer, CheckConstraint("pages > 0")),
+    Column("rating", Numeric(2, 1), CheckConstraint("rating BETWEEN 0 AND 5")),
+    Column("price", Numeric(6, 2), CheckConstraint("price >= 0")),
+)
+
+
+def upgrade(connection) -> None:
+    books.create(connection, checkfirst=True)
@@ -0,0 +1,19 @@
+from sqlalchemy import text
+
+from app.infrastructure.database.models.book_sqla import (
+    POSTGRES_SEARCH_DDL,
+    SQLITE_SEARCH_DDL,
+)
+
+VERSION = 2
+DESCRIPTION = "title search indexes (pg_trgm, tsvector, sqlite fts5)"
+
+DDL_BY_DIALECT = {
+    "postgresql": POSTGRES_SEARCH_DDL,
+    "sqlite": SQLITE_SEARCH_DDL,
+}
+
+
+def upgrade(connection) -> None:
+    for statement in DDL_BY_DIALECT.get(connection.dialect.name, []):
+        connection.execute(text(statement))
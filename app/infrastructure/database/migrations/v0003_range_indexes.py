@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Float, Index, Integer, MetaData, Table
+
+VERSION = 3
+DESCRIPTION = "b-tree indexes for pages, price and rating/price range filters"
+
+# only the indexed columns, detached from the v0001 table definition
+books = Table(
+    "books",
+    MetaData(),
+    Column("pages", Integer),
+    Column("rating", Float),
+    Column("price", Float),
+)
+
+INDEXES = [
+    Index("ix_books_pages", books.c.pages),
+    Index("ix_books_price", books.c.price),
+    # rating leads: rating-only filters use it too, price is checked in the index
+    Index("ix_books_rating_price", books.c.rating, books.c.price),
+]
+
+
+def upgrade(connection) -> None:
+    for index in INDEXES:
+        index.create(connection, checkfirst=True)
@@ -0,0 +1,15 @@
+from sqlalchemy import text
+
+VERSION = 4
+DESCRIPTION = "move the books id sequence past ids that were assigned by the app"
+
+SYNC_SEQUENCE = text(
+    "SELECT setval(pg_get_serial_sequence('books', 'id'), "
+    "COALESCE(MAX(id), 0) + 1, false) FROM books"
+)
+
+
+def upgrade(connection) -> None:
+    # ids used to be picked at random by the API, the sequence never saw them
+    if connection.dialect.name == "postgresql":
+        connection.execute(SYNC_SEQUENCE)
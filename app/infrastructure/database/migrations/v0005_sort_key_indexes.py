@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table
+
+VERSION = 5
+DESCRIPTION = "(sort key, id) b-tree indexes for index-ordered top-K reads"
+
+# only the indexed columns, detached from the v0001 table definition
+books = Table(
+    "books",
+    MetaData(),
+    Column("id", Integer),
+    Column("title", String),
+    Column("pages", Integer),
+    Column("rating", Float),
+    Column("price", Float),
+)
+
+# equal keys are not kept in id order inside a plain index on PostgreSQL, so
+# ORDER BY key, id needs id in the index to skip the sort step; the trigram and
+# fulltext indexes on title cannot return rows in order at all
+INDEXES = [
+    Index("ix_books_price_id", books.c.price, books.c.id),
+    Index("ix_books_rating_id", books.c.rating, books.c.id),
+    Index("ix_books_pages_id", books.c.pages, books.c.id),
+    Index("ix_books_title_id", books.c.title, books.c.id),
+]
+
+# v0003 indexes that are a prefix of their (key, id) replacement, range
+# filters use those
+SUPERSEDED = [
+    Index("ix_books_price", books.c.price),
+    Index("ix_books_pages", books.c.pages),
+]
+
+
+def upgrade(connection) -> None:
+    for index in INDEXES:
+        index.create(connection, checkfirst=True)
+    for index in SUPERSEDED:
+        index.drop(connection, checkfirst=True)
@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Integer, String, Float, DDL, Index, event
 
 from app.infrastructure.database.base import Base
 
 
 class BookORM(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        Index("ix_books_rating_price", "rating", "price"),
+        # sort keys with the id tiebreak, see migration v0005
+        Index("ix_books_price_id", "price", "id"),
+        Index("ix_books_rating_id", "rating", "id"),
+        Index("ix_books_pages_id", "pages", "id"),
+        Index("ix_books_title_id", "title", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -19,3 +27,46 @@ class BookORM(Base):
             f"author={self.author}, pages={self.pages}, "
             f"rating={self.rating}, price={self.price})>"
         )
+
+
+# title search indexes, kept in sync with init.sql and the migrations
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_books_title_trgm "
+    "ON books USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_books_title_fts "
+    "ON books USING gin (to_tsvector('english', title))",
+]
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS books_fts "
+    "USING fts5(title, content='books', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN "
+    "INSERT INTO books_fts(rowid, title) VALUES (new.id, new.title); END",
+    "CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN "
+    "INSERT INTO books_fts(books_fts, rowid, title) "
+    "VALUES ('delete', old.id, old.title); END",
+    "CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE ON books BEGIN "
+    "INSERT INTO books_fts(books_fts, rowid, title) "
+    "VALUES ('delete', old.id, old.title); "
+    "INSERT INTO books_fts(rowid, title) VALUES (new.id, new.title); END",
+    "INSERT INTO books_fts(books_fts) VALUES ('rebuild')",
+]
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(
+        BookORM.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        BookORM.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    BookORM.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS books_fts").execute_if(dialect="sqlite"),
+)
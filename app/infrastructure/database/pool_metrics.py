@@ -0,0 +1,151 @@
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.infrastructure.metrics.registry import (
+    CallbackCounter,
+    CallbackGauge,
+    MetricsRegistry,
+)
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.in_use = 0
+        self.in_use_peak = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def on_checkout(self, *args) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+
+    def on_checkin(self, *args) -> None:
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def on_invalidate(self, *args) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            average = (
+                self.wait_seconds_total / self.checkouts if self.checkouts else 0.0
+            )
+            return {
+                "size": pool.size(),
+                "in_use": self.in_use,
+                "in_use_peak": self.in_use_peak,
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_avg": average,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+class InstrumentedPoolMixin:
+    metrics: PoolMetrics
+
+    def __init__(self, *args, metrics: PoolMetrics | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or PoolMetrics()
+
+    def _do_get(self):
+        # SQLAlchemy has no event before a checkout starts waiting, so time the get
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine) -> PoolMetrics:
+    pool = engine.pool
+    event.listen(pool, "checkout", pool.metrics.on_checkout)
+    event.listen(pool, "checkin", pool.metrics.on_checkin)
+    event.listen(pool, "invalidate", pool.metrics.on_invalidate)
+    return pool.metrics
+
+
+def pool_stats(engine: Engine) -> dict:
+    return engine.pool.metrics.snapshot(engine.pool)
+
+
+def register_pool_metrics(registry: MetricsRegistry, engines: Dict[str, Engine]):
+    def snapshots():
+        return {name: pool_stats(engine) for name, engine in engines.items()}
+
+    def connections():
+        return {
+            (name, state): stats[state]
+            for name, stats in snapshots().items()
+            for state in ("in_use", "idle", "overflow")
+        }
+
+    def stat(key: str):
+        return lambda: {(name,): stats[key] for name, stats in snapshots().items()}
+
+    registry.register(
+        CallbackGauge(
+            "db_pool_connections",
+            "Pooled database connections by state",
+            ("engine", "state"),
+            connections,
+        )
+    )
+    registry.register(
+        CallbackCounter(
+            "db_pool_checkout_timeouts",
+            "Checkouts that timed out waiting for a connection",
+            ("engine",),
+            stat("timeouts"),
+        )
+    )
+    for key, documentation in (
+        ("wait_seconds_avg", "Average time spent waiting for a connection"),
+        ("wait_seconds_max", "Longest time spent waiting for a connection"),
+    ):
+        registry.register(
+            CallbackGauge(
+                f"db_pool_checkout_{key}", documentation, ("engine",), stat(key)
+            )
+        )
@@ -0,0 +1,89 @@
+import re
+
+from sqlalchemy import Boolean, Float, String, bindparam
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from app.infrastructure.database.models.book_sqla import BookORM
+
+TS_CONFIG = "english"
+_WORD = re.compile(r"\w+")
+
+
+def fts5_query(text: str) -> str:
+    # quote every word so user input can't inject FTS5 query syntax
+    return " ".join(f'"{word}"' for word in _WORD.findall(text)) or '""'
+
+
+class _TitleSearch(ColumnElement):
+    inherit_cache = True
+    _traverse_internals = [
+        ("text", InternalTraversal.dp_clauseelement),
+        ("fts_text", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, text: str):
+        self.text = bindparam(None, text, type_=String)
+        self.fts_text = bindparam(None, fts5_query(text), type_=String)
+
+
+class TitleMatches(_TitleSearch):
+    inherit_cache = True
+    type = Boolean()
+
+
+class TitleRank(_TitleSearch):
+    inherit_cache = True
+    type = Float()
+
+
+@compiles(TitleMatches)
+def _title_matches_default(element, compiler, **kw):
+    return compiler.process(
+        BookORM.title.ilike("%" + element.text + "%"),
+        **kw,
+    )
+
+
+@compiles(TitleMatches, "postgresql")
+def _title_matches_postgresql(element, compiler, **kw):
+    title = compiler.process(BookORM.__table__.c.title, **kw)
+    text = compiler.process(element.text, **kw)
+    return (
+        f"to_tsvector('{TS_CONFIG}', {title}) "
+        f"@@ websearch_to_tsquery('{TS_CONFIG}', {text})"
+    )
+
+
+@compiles(TitleMatches, "sqlite")
+def _title_matches_sqlite(element, compiler, **kw):
+    book_id = compiler.process(BookORM.__table__.c.id, **kw)
+    text = compiler.process(element.fts_text, **kw)
+    return f"{book_id} IN (SELECT rowid FROM books_fts WHERE books_fts MATCH {text})"
+
+
+@compiles(TitleRank)
+def _title_rank_default(element, compiler, **kw):
+    return "0"
+
+
+@compiles(TitleRank, "postgresql")
+def _title_rank_postgresql(element, compiler, **kw):
+    title = compiler.process(BookORM.__table__.c.title, **kw)
+    text = compiler.process(element.text, **kw)
+    return (
+        f"ts_rank(to_tsvector('{TS_CONFIG}', {title}), "
+        f"websearch_to_tsquery('{TS_CONFIG}', {text}))"
+    )
+
+
+@compiles(TitleRank, "sqlite")
+def _title_rank_sqlite(element, compiler, **kw):
+    book_id = compiler.process(BookORM.__table__.c.id, **kw)
+    text = compiler.process(element.fts_text, **kw)
+    # bm25() is lower-is-better, negate it so both dialects sort rank DESC
+    return (
+        f"(SELECT -bm25(books_fts) FROM books_fts "
+        f"WHERE books_fts MATCH {text} AND books_fts.rowid = {book_id})"
+    )
@@ -1,18 +1,43 @@
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
-DB_USER = "postgres"
-DB_PASSWORD = "secret"
-DB_HOST = "db"
-# DB_HOST = "localhost"
-DB_PORT = 5432
-DB_NAME = "mydb"
+from app.config import settings
+from app.infrastructure.database.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+    register_pool_metrics,
+)
+from app.infrastructure.metrics.app_metrics import metrics_registry
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:" f"{DB_PORT}/{DB_NAME}"
+POOL_OPTIONS = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    query_cache_size=settings.db_statement_cache_size,
+)
 
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    settings.database_url, poolclass=InstrumentedQueuePool, **POOL_OPTIONS
+)
+instrument_engine(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+async_engine = create_async_engine(
+    settings.async_database_url, poolclass=InstrumentedAsyncQueuePool, **POOL_OPTIONS
+)
+instrument_engine(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+register_pool_metrics(
+    metrics_registry, {"sync": engine, "async": async_engine.sync_engine}
+)
+
 
 def get_db():
     db = SessionLocal()
@@ -20,3 +45,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,183 @@
+import threading
+from typing import Callable, Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional, only needed when the catalog index is enabled
+    np = None
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import MISSING_INT, BookBatch
+
+RANGE_COLUMNS = ("pages", "rating", "price")
+RANGE_FILTERS = {
+    f"{bound}_{column}": (column, bound)
+    for column in RANGE_COLUMNS
+    for bound in ("min", "max")
+}
+# (pages, rating, price), NaN where the column is NULL
+IndexRow = Tuple[float, float, float]
+
+
+class CatalogIndex:
+    def __init__(self):
+        if np is None:
+            raise RuntimeError("numpy is required for the in-memory catalog index")
+        self._lock = threading.Lock()
+        # held for a whole reload, concurrent callers wait for it instead of
+        # each reading the full table
+        self._load_lock = threading.Lock()
+        # id -> (pages, rating, price); the arrays are rebuilt from it lazily
+        self._rows: Dict[int, IndexRow] = {}
+        self._stale = True
+        # bumped by every write; a reload checks it to see what it raced with
+        self._generation = 0
+        self._stale_generation = 0
+        # writes made while a reload reads the table, replayed on top of it
+        self._journal: List[Tuple[int, IndexRow | None]] | None = None
+        self._dirty = True
+        self._ids = np.empty(0, dtype=np.int64)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._orders: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @staticmethod
+    def supports(filters: dict) -> bool:
+        return all(
+            name in RANGE_FILTERS or name == "search_mode"
+            for name, value in filters.items()
+            if value is not None
+        )
+
+    @staticmethod
+    def _rows_from(books: BookBatch) -> Dict[int, IndexRow]:
+        pages = np.asarray(books.pages, dtype=np.float64)
+        pages[pages == MISSING_INT] = np.nan
+        rows = zip(
+            books.ids,
+            pages.tolist(),
+            books.ratings.tolist(),
+            books.prices.tolist(),
+        )
+        return {book_id: tuple(values) for book_id, *values in rows}
+
+    def refresh(self, fetch: Callable[[], BookBatch]) -> bool:
+        # reloads a stale index, returns whether it is current afterwards
+        if not self._stale:
+            return True
+        with self._load_lock:
+            with self._lock:
+                if not self._stale:
+                    return True
+                started = self._generation
+                self._journal = []
+            try:
+                rows = self._rows_from(fetch())
+            except BaseException:
+                with self._lock:
+                    self._journal = None
+                raise
+            with self._lock:
+                journal, self._journal = self._journal, None
+                # the read may or may not have seen these writes, replaying
+                # them leaves every touched row at its latest known state
+                for book_id, values in journal:
+                    if values is None:
+                        rows.pop(book_id, None)
+                    else:
+                        rows[book_id] = values
+                self._rows = rows
+                self._dirty = True
+                # a bulk write marked during the read may postdate what it saw
+                self._stale = self._stale_generation > started
+                return not self._stale
+
+    def _record(self, book_id: int, values: IndexRow | None) -> None:
+        # callers hold the lock
+        self._generation += 1
+        self._dirty = True
+        if self._journal is not None:
+            self._journal.append((book_id, values))
+
+    def mark_stale(self) -> None:
+        # the next query reloads everything, used when affected ids are unknown
+        with self._lock:
+            self._generation += 1
+            self._stale_generation = self._generation
+            self._stale = True
+
+    def upsert(self, book: BookEntity) -> None:
+        values = tuple(
+            np.nan if value is None else float(value)
+            for value in (book.pages, book.rating, book.price)
+        )
+        with self._lock:
+            self._rows[book.id] = values
+            self._record(book.id, values)
+
+    def remove(self, book_id: int) -> None:
+        with self._lock:
+            self._rows.pop(book_id, None)
+            self._record(book_id, None)
+
+    def _rebuild(self) -> None:
+        ids = np.fromiter(self._rows.keys(), dtype=np.int64, count=len(self._rows))
+        values = np.array(list(self._rows.values()), dtype=np.float64).reshape(-1, 3)
+        self._ids = ids
+        for position, column in enumerate(RANGE_COLUMNS):
+            data = values[:, position]
+            order = np.argsort(data, kind="stable")
+            self._columns[column] = data
+            self._orders[column] = order
+            # NaN sorts last, searchsorted never reaches it for finite bounds
+            self._sorted[column] = data[order]
+        self._dirty = False
+
+    def query(
+        self, limit: int | None = None, after_id: int | None = None, **filters
+    ) -> np.ndarray:
+        bounds = {column: [-np.inf, np.inf] for column in RANGE_COLUMNS}
+        constrained = set()
+        for name, value in filters.items():
+            if value is None or name not in RANGE_FILTERS:
+                continue
+            column, bound = RANGE_FILTERS[name]
+            bounds[column][0 if bound == "min" else 1] = value
+            constrained.add(column)
+
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            if not constrained:
+                positions = np.arange(len(self._ids))
+            else:
+                # narrow with the most selective column, mask the others
+                spans = {}
+                for column in constrained:
+                    low, high = bounds[column]
+                    values = self._sorted[column]
+                    spans[column] = (
+                        np.searchsorted(values, low, side="left"),
+                        np.searchsorted(values, high, side="right"),
+                    )
+                driver = min(spans, key=lambda c: spans[c][1] - spans[c][0])
+                start, stop = spans[driver]
+                positions = self._orders[driver][start:stop]
+                for column in constrained - {driver}:
+                    low, high = bounds[column]
+                    values = self._columns[column][positions]
+                    positions = positions[(values >= low) & (values <= high)]
+            ids = np.sort(self._ids[positions])
+
+        if after_id is not None:
+            ids = ids[np.searchsorted(ids, after_id, side="right") :]
+        if limit is not None:
+            ids = ids[:limit]
+        return ids
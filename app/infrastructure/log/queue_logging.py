@@ -0,0 +1,83 @@
+import logging
+import queue
+import random
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Sequence
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# "METHOD /path/template" of the route handling the current request
+current_route: ContextVar[str | None] = ContextVar("current_route", default=None)
+
+
+class RouteSampler(logging.Filter):
+    def __init__(self, rates: Dict[str, float], default_rate: float = 1.0):
+        super().__init__()
+        self.rates = rates
+        self.default_rate = default_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # warnings and errors are never sampled away
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(current_route.get(), self.default_rate)
+        return rate >= 1 or random.random() < rate
+
+
+class BookSummary:
+    # formatted only if the record is actually emitted
+    def __init__(self, books: Sequence, max_ids: int = 10):
+        self.books = books
+        self.max_ids = max_ids
+
+    def __str__(self) -> str:
+        count = len(self.books)
+        ids = [str(self.books[i].id) for i in range(min(count, self.max_ids))]
+        if count > self.max_ids:
+            ids.append(f"... +{count - self.max_ids} more")
+        return f"{count} rows, ids=[{', '.join(ids)}]"
+
+
+class DeferredQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the stock prepare() merges args into msg and renders exc_info on the
+        # calling thread; enqueue the record as is and let the listener's
+        # handler do all of it
+        return record
+
+
+def parse_sample_rates(text: str) -> Dict[str, float]:
+    rates = {}
+    for part in filter(None, (part.strip() for part in text.split(","))):
+        route, rate = part.rsplit("=", 1)
+        rates[route.strip()] = float(rate)
+    return rates
+
+
+def configure_logging(
+    level: str = "INFO",
+    sample_rates: Dict[str, float] | None = None,
+    default_rate: float = 1.0,
+    handler: logging.Handler | None = None,
+) -> QueueListener:
+    # request threads only enqueue records, message formatting and I/O happen
+    # on the listener thread
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(records)
+    queue_handler.addFilter(RouteSampler(sample_rates or {}, default_rate))
+
+    if handler is None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        if isinstance(existing, QueueHandler):
+            root.removeHandler(existing)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = QueueListener(records, handler, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -24,3 +24,16 @@ class BookMapper:
             price=entity.price,
             rating=entity.rating,
         )
+
+    @staticmethod
+    def to_row(entity: BookEntity) -> dict:
+        row = {
+            "title": entity.title,
+            "author": entity.author,
+            "pages": entity.pages,
+            "price": entity.price,
+            "rating": entity.rating,
+        }
+        if entity.id is not None:
+            row["id"] = entity.id
+        return row
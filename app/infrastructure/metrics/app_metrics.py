@@ -0,0 +1,42 @@
+from app.infrastructure.metrics.registry import Gauge, Histogram, MetricsRegistry
+
+SQL_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+metrics_registry = MetricsRegistry()
+
+REQUEST_LATENCY = metrics_registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Request latency by route",
+        ("method", "route", "status"),
+    )
+)
+REQUESTS_IN_FLIGHT = metrics_registry.register(
+    Gauge(
+        "http_requests_in_flight",
+        "Requests currently being handled by route",
+        ("method", "route"),
+    )
+)
+REQUEST_SQL_QUERIES = metrics_registry.register(
+    Histogram(
+        "http_request_sql_queries",
+        "SQL statements executed per request",
+        ("method", "route"),
+        buckets=SQL_QUERY_BUCKETS,
+    )
+)
+REQUEST_SQL_DURATION = metrics_registry.register(
+    Histogram(
+        "http_request_sql_duration_seconds",
+        "Time spent executing SQL per request",
+        ("method", "route"),
+    )
+)
+REPOSITORY_LATENCY = metrics_registry.register(
+    Histogram(
+        "repository_call_duration_seconds",
+        "Book repository call latency by method",
+        ("repository", "method"),
+    )
+)
@@ -0,0 +1,111 @@
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from typing import Sequence, Set
+
+import fastapi
+import pydantic
+import sqlalchemy
+import starlette
+
+import app
+
+
+def _package_dir(module) -> str:
+    return os.path.dirname(module.__file__) + os.sep
+
+
+# stacks without a frame from these packages belong to idle or unrelated threads
+PROFILED_PACKAGES = tuple(
+    _package_dir(module) for module in (app, fastapi, starlette, pydantic, sqlalchemy)
+)
+
+
+# idents of the threads working on the profiled request, the middleware sets it
+# and threadpool workers running the request's sync handler add themselves
+profiled_threads: ContextVar[Set[int] | None] = ContextVar(
+    "profiled_threads", default=None
+)
+
+
+def profile_current_thread() -> None:
+    threads = profiled_threads.get()
+    if threads is not None:
+        threads.add(threading.get_ident())
+
+
+class StackSampler:
+    suffix = "collapsed"
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        packages: Sequence[str] = PROFILED_PACKAGES,
+        threads: Set[int] | None = None,
+    ):
+        self.interval = interval
+        self.packages = tuple(packages)
+        # None samples every thread
+        self.threads = threads
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if self.threads is None or ident in self.threads:
+                    self.sample(frame)
+
+    def sample(self, frame) -> None:
+        names = []
+        relevant = False
+        while frame is not None:
+            code = frame.f_code
+            relevant = relevant or code.co_filename.startswith(self.packages)
+            module = frame.f_globals.get("__name__", "?")
+            names.append(f"{module}:{code.co_name}")
+            frame = frame.f_back
+        if relevant:
+            self.stacks[";".join(reversed(names))] += 1
+
+    def write(self, path: str) -> None:
+        # one "frame;frame;frame count" line per stack, as flamegraph.pl expects
+        with open(path, "w") as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f"{stack} {count}\n")
+
+
+class CallProfiler:
+    suffix = "prof"
+
+    def __init__(self, interval: float | None = None, threads: Set[int] | None = None):
+        # since 3.12 cProfile hooks every thread and can't be narrowed to some,
+        # so the profile is process-wide: sync handlers in the threadpool are
+        # included, but so is anything other requests run meanwhile
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def write(self, path: str) -> None:
+        self.profile.dump_stats(path)
+
+
+PROFILERS = {"collapsed": StackSampler, "pstats": CallProfiler}
@@ -0,0 +1,89 @@
+from typing import AsyncIterator, List, Sequence
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+from app.domain.repositories.async_book_repository_protocol import (
+    AsyncBookRepositoryProtocol,
+)
+from app.infrastructure.cache.catalog_version import CatalogVersion, catalog_version
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
+from app.infrastructure.repositories.caching_book_repository import (
+    FILTER_CACHE_MAX_ROWS,
+    cached_book,
+    filter_cache_key,
+)
+
+
+class AsyncCachingBookRepository(AsyncBookRepositoryProtocol):
+    def __init__(
+        self,
+        repository: AsyncBookRepositoryProtocol,
+        cache: LRUTTLCache,
+        filter_cache: LRUTTLCache | None = None,
+        version: CatalogVersion = catalog_version,
+    ):
+        self.repository = repository
+        self.cache = cache
+        self.filter_cache = filter_cache
+        self.version = version
+
+    async def get_all_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> BookBatch:
+        return await self.repository.get_all_books(
+            limit=limit, after_id=after_id, fields=fields
+        )
+
+    async def get_book_by_id(self, book_id: int) -> BookEntity:
+        book = cached_book(self.cache, self.version, book_id)
+        if book is None:
+            seen = self.version.row_version(book_id)
+            book = await self.repository.get_book_by_id(book_id)
+            self.cache.set(book_id, (seen, book))
+        return book
+
+    async def filter_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+        **filters,
+    ) -> BookBatch:
+        if self.filter_cache is None:
+            return await self.repository.filter_books(
+                limit=limit, after_id=after_id, fields=fields, **filters
+            )
+        key = filter_cache_key(self.version.value, limit, after_id, filters, fields)
+        books = self.filter_cache.get(key)
+        if books is None:
+            books = await self.repository.filter_books(
+                limit=limit, after_id=after_id, fields=fields, **filters
+            )
+            if len(books) <= FILTER_CACHE_MAX_ROWS:
+                self.filter_cache.set(key, books)
+        return books
+
+    def stream_books(
+        self, batch_size: int = 1000, **filters
+    ) -> AsyncIterator[BookEntity]:
+        return self.repository.stream_books(batch_size=batch_size, **filters)
+
+    async def add_book(self, book: BookEntity) -> BookEntity:
+        added = await self.repository.add_book(book)
+        self.cache.invalidate(added.id)
+        return added
+
+    async def update_book(self, book_id: int, book_update_data: dict) -> BookEntity:
+        try:
+            return await self.repository.update_book(book_id, book_update_data)
+        finally:
+            self.cache.invalidate(book_id)
+
+    async def delete_book(self, book_id: int) -> None:
+        try:
+            await self.repository.delete_book(book_id)
+        finally:
+            self.cache.invalidate(book_id)
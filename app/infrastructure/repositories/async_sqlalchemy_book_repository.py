@@ -0,0 +1,125 @@
+from typing import AsyncIterator, List, Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.cache.catalog_version import CatalogVersion, catalog_version
+from app.infrastructure.database.id_allocator import ADVANCE_SEQUENCE
+from app.infrastructure.mappers.book_mapper import BookMapper
+from app.infrastructure.repositories.queries import (
+    BOOK_COLUMNS,
+    UPDATABLE_COLUMNS,
+    apply_filters,
+    book_columns,
+    apply_sort,
+    order_and_paginate,
+    paginate,
+    update_returning,
+    delete_returning,
+)
+from app.domain.exceptions import BookAlreadyExists, DatabaseError, BookDoesntExist
+from app.infrastructure.database.models.book_sqla import BookORM
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+from app.domain.repositories.async_book_repository_protocol import (
+    AsyncBookRepositoryProtocol,
+)
+
+
+class AsyncSQLAlchemyBookRepository(AsyncBookRepositoryProtocol):
+    def __init__(
+        self, session: AsyncSession, version: CatalogVersion = catalog_version
+    ):
+        self.session = session
+        self.version = version
+
+    async def get_all_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> BookBatch:
+        stmt = paginate(select(*book_columns(fields)), limit, after_id)
+        return BookBatch.from_rows(await self.session.execute(stmt), fields)
+
+    async def get_book_by_id(self, book_id: int) -> BookEntity:
+        book_db = await self.session.get(BookORM, book_id)
+        if book_db:
+            book = BookMapper.to_entity(book_db)
+            return book
+        else:
+            raise BookDoesntExist(book_id)
+
+    async def filter_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+        **filters,
+    ) -> BookBatch:
+        stmt = apply_filters(select(*book_columns(fields)), filters)
+        stmt = order_and_paginate(stmt, filters, limit, after_id)
+        return BookBatch.from_rows(await self.session.execute(stmt), fields)
+
+    async def stream_books(
+        self, batch_size: int = 1000, **filters
+    ) -> AsyncIterator[BookEntity]:
+        stmt = apply_filters(select(BookORM), filters)
+        if filters.get("sort") is not None:
+            stmt = apply_sort(stmt, filters["sort"])
+        else:
+            stmt = stmt.order_by(BookORM.id)
+        result = await self.session.stream_scalars(
+            stmt.execution_options(yield_per=batch_size)
+        )
+        try:
+            async for book_db in result:
+                yield BookMapper.to_entity(book_db)
+        finally:
+            await result.close()
+
+    async def add_book(self, book: BookEntity):
+        stmt = (
+            insert(BookORM).values(**BookMapper.to_row(book)).returning(*BOOK_COLUMNS)
+        )
+        try:
+            row = (await self.session.execute(stmt)).one()
+            if book.id is not None and self.session.bind.dialect.name == "postgresql":
+                await self.session.execute(ADVANCE_SEQUENCE, {"book_id": book.id})
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise BookAlreadyExists(book.id)
+        except SQLAlchemyError:
+            await self.session.rollback()
+            raise DatabaseError
+        self.version.bump([row.id])
+        return BookEntity(**row._mapping)
+
+    async def update_book(self, book_id: int, book_update_data: dict):
+        if not UPDATABLE_COLUMNS.intersection(book_update_data):
+            return await self.get_book_by_id(book_id)
+        try:
+            row = (
+                await self.session.execute(update_returning(book_id, book_update_data))
+            ).one_or_none()
+            await self.session.commit()
+        except SQLAlchemyError:  # db field constraint violated
+            await self.session.rollback()
+            raise DatabaseError
+        if row is None:
+            raise BookDoesntExist(book_id)
+        self.version.bump([book_id])
+        return BookEntity(**row._mapping)
+
+    async def delete_book(self, book_id: int):
+        try:
+            deleted = (await self.session.execute(delete_returning(book_id))).scalar()
+            await self.session.commit()
+        except SQLAlchemyError:
+            await self.session.rollback()
+            raise DatabaseError
+        if deleted is None:
+            raise BookDoesntExist(book_id)
+        self.version.bump([book_id])
@@ -0,0 +1,175 @@
+from typing import Hashable, Iterator, List, Sequence, Tuple
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+from app.domain.repositories.book_repository_protocol import BookRepositoryProtocol
+from app.infrastructure.cache.catalog_version import CatalogVersion, catalog_version
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
+from app.infrastructure.repositories.queries import ID_CHUNK_SIZE
+
+# larger results are not worth pinning in memory
+FILTER_CACHE_MAX_ROWS = 1_000
+
+
+def filter_cache_key(
+    version: int,
+    limit: int | None,
+    after_id: int | None,
+    filters: dict,
+    fields: Sequence[str] | None = None,
+) -> Hashable:
+    normalized = tuple(
+        sorted((name, value) for name, value in filters.items() if value is not None)
+    )
+    return version, limit, after_id, normalized, fields and tuple(fields)
+
+
+def cached_book(
+    cache: LRUTTLCache, version: CatalogVersion, book_id: int
+) -> BookEntity | None:
+    entry = cache.get(book_id)
+    if entry is None:
+        return None
+    seen, book = entry
+    # entries carry the row version read before the row was loaded; a write
+    # that committed while the load was in flight has moved it since
+    if seen != version.row_version(book_id):
+        cache.invalidate(book_id)
+        return None
+    return book
+
+
+class CachingBookRepository(BookRepositoryProtocol):
+    def __init__(
+        self,
+        repository: BookRepositoryProtocol,
+        cache: LRUTTLCache,
+        filter_cache: LRUTTLCache | None = None,
+        version: CatalogVersion = catalog_version,
+    ):
+        self.repository = repository
+        self.cache = cache
+        self.filter_cache = filter_cache
+        self.version = version
+
+    def get_all_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> BookBatch:
+        return self.repository.get_all_books(
+            limit=limit, after_id=after_id, fields=fields
+        )
+
+    def get_book_by_id(self, book_id: int) -> BookEntity:
+        book = cached_book(self.cache, self.version, book_id)
+        if book is None:
+            seen = self.version.row_version(book_id)
+            book = self.repository.get_book_by_id(book_id)
+            self.cache.set(book_id, (seen, book))
+        return book
+
+    def get_books_by_ids(
+        self, book_ids: Sequence[int], chunk_size: int = ID_CHUNK_SIZE
+    ) -> BookBatch:
+        books, missing = [], []
+        for book_id in sorted(set(book_ids)):
+            book = cached_book(self.cache, self.version, book_id)
+            if book is None:
+                missing.append(book_id)
+            else:
+                books.append(book)
+        if missing:
+            seen = {book_id: self.version.row_version(book_id) for book_id in missing}
+            for book in self.repository.get_books_by_ids(
+                missing, chunk_size=chunk_size
+            ):
+                self.cache.set(book.id, (seen[book.id], book))
+                books.append(book)
+            books.sort(key=lambda book: book.id)
+        return BookBatch.from_entities(books)
+
+    def filter_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+        **filters,
+    ) -> BookBatch:
+        if self.filter_cache is None:
+            return self.repository.filter_books(
+                limit=limit, after_id=after_id, fields=fields, **filters
+            )
+        # read the version before querying so a concurrent write can only
+        # leave the result under an already-outdated key
+        key = filter_cache_key(self.version.value, limit, after_id, filters, fields)
+        books = self.filter_cache.get(key)
+        if books is None:
+            books = self.repository.filter_books(
+                limit=limit, after_id=after_id, fields=fields, **filters
+            )
+            if len(books) <= FILTER_CACHE_MAX_ROWS:
+                self.filter_cache.set(key, books)
+        return books
+
+    def stream_books(self, batch_size: int = 1000, **filters) -> Iterator[BookEntity]:
+        return self.repository.stream_books(batch_size=batch_size, **filters)
+
+    def get_book_statistics(
+        self, buckets: int = 10, top_authors: int = 10, **filters
+    ) -> dict:
+        if self.filter_cache is None:
+            return self.repository.get_book_statistics(
+                buckets=buckets, top_authors=top_authors, **filters
+            )
+        key = (
+            "statistics",
+            filter_cache_key(self.version.value, None, None, filters),
+            buckets,
+            top_authors,
+        )
+        statistics = self.filter_cache.get(key)
+        if statistics is None:
+            statistics = self.repository.get_book_statistics(
+                buckets=buckets, top_authors=top_authors, **filters
+            )
+            self.filter_cache.set(key, statistics)
+        return statistics
+
+    def add_book(self, book: BookEntity) -> BookEntity:
+        added = self.repository.add_book(book)
+        self.cache.invalidate(added.id)
+        return added
+
+    def add_books(
+        self, books: List[BookEntity], chunk_size: int = 1000
+    ) -> List[int | Exception]:
+        results = self.repository.add_books(books, chunk_size=chunk_size)
+        for result in results:
+            if isinstance(result, int):
+                self.cache.invalidate(result)
+        return results
+
+    def update_book(self, book_id: int, book_update_data: dict) -> BookEntity:
+        try:
+            return self.repository.update_book(book_id, book_update_data)
+        finally:
+            self.cache.invalidate(book_id)
+
+    def reprice_books(
+        self, adjustment: dict, return_rows: bool = False, **filters
+    ) -> Tuple[int, List[BookEntity] | None]:
+        try:
+            return self.repository.reprice_books(
+                adjustment, return_rows=return_rows, **filters
+            )
+        finally:
+            # the affected ids are not known up front
+            self.cache.clear()
+
+    def delete_book(self, book_id: int) -> None:
+        try:
+            self.repository.delete_book(book_id)
+        finally:
+            self.cache.invalidate(book_id)
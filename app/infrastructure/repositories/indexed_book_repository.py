@@ -0,0 +1,105 @@
+from typing import Iterator, List, Sequence, Tuple
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+from app.domain.repositories.book_repository_protocol import BookRepositoryProtocol
+from app.infrastructure.index.catalog_index import CatalogIndex
+from app.infrastructure.repositories.queries import ID_CHUNK_SIZE
+
+
+class IndexedBookRepository(BookRepositoryProtocol):
+    def __init__(self, repository: BookRepositoryProtocol, index: CatalogIndex):
+        self.repository = repository
+        self.index = index
+
+    def _ensure_loaded(self) -> bool:
+        return self.index.refresh(self.repository.get_all_books)
+
+    def get_all_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> BookBatch:
+        return self.repository.get_all_books(
+            limit=limit, after_id=after_id, fields=fields
+        )
+
+    def get_book_by_id(self, book_id: int) -> BookEntity:
+        return self.repository.get_book_by_id(book_id)
+
+    def get_books_by_ids(
+        self, book_ids: Sequence[int], chunk_size: int = ID_CHUNK_SIZE
+    ) -> BookBatch:
+        return self.repository.get_books_by_ids(book_ids, chunk_size=chunk_size)
+
+    def filter_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+        **filters,
+    ) -> BookBatch:
+        # a reload that raced with a bulk write leaves the index stale, the
+        # database answers until the next reload catches up
+        if not self.index.supports(filters) or not self._ensure_loaded():
+            return self.repository.filter_books(
+                limit=limit, after_id=after_id, fields=fields, **filters
+            )
+        book_ids = self.index.query(limit=limit, after_id=after_id, **filters)
+        # the database is only used to hydrate the matching ids; whole rows are
+        # read here and a sparse fieldset is applied when the response is encoded
+        return self.repository.get_books_by_ids(book_ids.tolist())
+
+    def stream_books(self, batch_size: int = 1000, **filters) -> Iterator[BookEntity]:
+        return self.repository.stream_books(batch_size=batch_size, **filters)
+
+    def get_book_statistics(
+        self, buckets: int = 10, top_authors: int = 10, **filters
+    ) -> dict:
+        return self.repository.get_book_statistics(
+            buckets=buckets, top_authors=top_authors, **filters
+        )
+
+    def add_book(self, book: BookEntity) -> BookEntity:
+        added = self.repository.add_book(book)
+        self.index.upsert(added)
+        return added
+
+    def add_books(
+        self, books: List[BookEntity], chunk_size: int = 1000
+    ) -> List[int | Exception]:
+        results = self.repository.add_books(books, chunk_size=chunk_size)
+        # index what the database stored: NUMERIC columns round the prices and
+        # ratings the client sent
+        inserted = [result for result in results if isinstance(result, int)]
+        if inserted:
+            for book in self.repository.get_books_by_ids(inserted):
+                self.index.upsert(book)
+        return results
+
+    def update_book(self, book_id: int, book_update_data: dict) -> BookEntity:
+        updated = self.repository.update_book(book_id, book_update_data)
+        self.index.upsert(updated)
+        return updated
+
+    def reprice_books(
+        self, adjustment: dict, return_rows: bool = False, **filters
+    ) -> Tuple[int, List[BookEntity] | None]:
+        try:
+            count, books = self.repository.reprice_books(
+                adjustment, return_rows=return_rows, **filters
+            )
+        except Exception:
+            self.index.mark_stale()
+            raise
+        if books is None:
+            self.index.mark_stale()
+        else:
+            for book in books:
+                self.index.upsert(book)
+        return count, books
+
+    def delete_book(self, book_id: int) -> None:
+        self.repository.delete_book(book_id)
+        self.index.remove(book_id)
@@ -0,0 +1,170 @@
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    any_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    literal,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.domain.entities.book import MAX_PRICE
+from app.infrastructure.database.models.book_sqla import BookORM
+from app.infrastructure.database.search import TitleMatches, TitleRank
+
+BOOK_COLUMNS = (
+    BookORM.id,
+    BookORM.title,
+    BookORM.author,
+    BookORM.pages,
+    BookORM.rating,
+    BookORM.price,
+)
+UPDATABLE_COLUMNS = frozenset(column.key for column in BOOK_COLUMNS[1:])
+COLUMNS_BY_FIELD = {column.key: column for column in BOOK_COLUMNS}
+
+ID_CHUNK_SIZE = 5_000
+
+SORT_COLUMNS = {
+    "price": BookORM.price,
+    "rating": BookORM.rating,
+    "pages": BookORM.pages,
+    "title": BookORM.title,
+}
+
+
+def book_columns(fields: Sequence[str] | None) -> tuple:
+    # the select list for a sparse fieldset, in the order of fields
+    if fields is None:
+        return BOOK_COLUMNS
+    return tuple(COLUMNS_BY_FIELD[name] for name in fields)
+
+
+def ids_match(book_ids: Sequence[int], dialect: str):
+    if dialect == "postgresql":
+        # one array parameter instead of one bind parameter per id
+        return BookORM.id == any_(bindparam(None, list(book_ids), type_=ARRAY(Integer)))
+    return BookORM.id.in_(book_ids)
+
+
+def is_fulltext_search(filters: dict) -> bool:
+    return (
+        filters.get("title") is not None
+        and filters.get("search_mode", "substring") == "fulltext"
+    )
+
+
+def apply_filters(stmt, filters: dict):
+    if is_fulltext_search(filters):
+        stmt = stmt.where(TitleMatches(filters["title"]))
+    elif filters.get("title") is not None:
+        stmt = stmt.where(BookORM.title.ilike(f"%{filters['title']}%"))
+    if filters.get("min_pages") is not None:
+        stmt = stmt.where(BookORM.pages >= filters["min_pages"])
+    if filters.get("max_pages") is not None:
+        stmt = stmt.where(BookORM.pages <= filters["max_pages"])
+    if filters.get("min_rating") is not None:
+        stmt = stmt.where(BookORM.rating >= filters["min_rating"])
+    if filters.get("max_rating") is not None:
+        stmt = stmt.where(BookORM.rating <= filters["max_rating"])
+    if filters.get("min_price") is not None:
+        stmt = stmt.where(BookORM.price >= filters["min_price"])
+    if filters.get("max_price") is not None:
+        stmt = stmt.where(BookORM.price <= filters["max_price"])
+    return stmt
+
+
+def apply_search_order(stmt, filters: dict):
+    if is_fulltext_search(filters):
+        stmt = stmt.order_by(TitleRank(filters["title"]).desc())
+    return stmt
+
+
+def parse_sort(sort: str) -> List[Tuple[str, bool]]:
+    # "-rating,price" -> [("rating", True), ("price", False)], repeats dropped
+    keys = {}
+    for part in sort.split(","):
+        name = part.strip().lstrip("-")
+        if name not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort key: {name}")
+        keys.setdefault(name, part.strip().startswith("-"))
+    return list(keys.items())
+
+
+def apply_sort(stmt, sort: str):
+    keys = parse_sort(sort)
+    order = [
+        SORT_COLUMNS[name].desc() if descending else SORT_COLUMNS[name]
+        for name, descending in keys
+    ]
+    # id follows the leading key's direction, so a single-key sort reads its
+    # (key, id) index forwards or backwards with no sort step; mixed
+    # directions over several keys still sort
+    order.append(BookORM.id.desc() if keys[0][1] else BookORM.id)
+    return stmt.order_by(*order)
+
+
+def paginate(stmt, limit: int | None, after_id: int | None):
+    # unpaginated reads stay unordered so range filters can use their indexes
+    if limit is None and after_id is None:
+        return stmt
+    if after_id is not None:
+        stmt = stmt.where(BookORM.id > after_id)
+    return stmt.order_by(BookORM.id).limit(limit)
+
+
+def order_and_paginate(stmt, filters: dict, limit: int | None, after_id: int | None):
+    if filters.get("sort") is None:
+        return paginate(apply_search_order(stmt, filters), limit, after_id)
+    if after_id is not None:
+        raise ValueError("Cursor pagination is not supported for sorted results")
+    # ORDER BY ... LIMIT lets the database stop after the first rows (top-K)
+    return apply_sort(stmt, filters["sort"]).limit(limit)
+
+
+def adjusted_price(mode: str, value: float, round_to: float | None = None):
+    if mode == "percent":
+        price = BookORM.price * (1 + value / 100)
+    elif mode == "absolute":
+        price = BookORM.price + value
+    elif mode == "set":
+        price = literal(value)
+    else:
+        raise ValueError(f"Unknown price adjustment mode: {mode}")
+    if round_to is not None:
+        price = func.round(cast(price / round_to, Numeric)) * round_to
+    if mode != "set" or round_to is not None:
+        # relative results and rounding can leave the range, a validated
+        # fixed price can't
+        price = case((price < 0, 0), (price > MAX_PRICE, MAX_PRICE), else_=price)
+    # NUMERIC(6,2) in the database, round explicitly so SQLite matches
+    return func.round(cast(price, Numeric), 2)
+
+
+def update_returning(book_id: int, values: dict):
+    # single round trip, no identity map load; unknown fields are ignored
+    values = {
+        field: value for field, value in values.items() if field in UPDATABLE_COLUMNS
+    }
+    return (
+        update(BookORM)
+        .where(BookORM.id == book_id)
+        .values(**values)
+        .returning(*BOOK_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_returning(book_id: int):
+    return (
+        delete(BookORM)
+        .where(BookORM.id == book_id)
+        .returning(BookORM.id)
+        .execution_options(synchronize_session=False)
+    )
@@ -1,27 +1,61 @@
-from typing import List
+from typing import Iterator, List, Sequence, Tuple
 
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError, DataError
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from app.infrastructure.cache.catalog_version import CatalogVersion, catalog_version
+from app.infrastructure.database.id_allocator import (
+    SequenceIdAllocator,
+    book_id_allocator,
+)
 from app.infrastructure.mappers.book_mapper import BookMapper
+from app.infrastructure.repositories.queries import (
+    BOOK_COLUMNS,
+    UPDATABLE_COLUMNS,
+    ID_CHUNK_SIZE,
+    ids_match,
+    adjusted_price,
+    apply_filters,
+    book_columns,
+    apply_sort,
+    order_and_paginate,
+    paginate,
+    update_returning,
+    delete_returning,
+)
+from app.infrastructure.repositories.statistics import catalog_statistics
 from app.domain.exceptions import BookAlreadyExists, DatabaseError, BookDoesntExist
 from app.infrastructure.database.models.book_sqla import BookORM
 from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
 from app.domain.repositories.book_repository_protocol import BookRepositoryProtocol
 
+CONFLICT_IGNORING_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
 
 class SQLAlchemyBookRepository(BookRepositoryProtocol):
-    def __init__(self, session):
+    def __init__(
+        self,
+        session,
+        version: CatalogVersion = catalog_version,
+        id_allocator: SequenceIdAllocator = book_id_allocator,
+    ):
         self.session = session
+        self.version = version
+        self.id_allocator = id_allocator
 
-    def get_all_books(self) -> List[BookEntity] | None:
-        stmt = select(BookORM)
-        result = self.session.execute(stmt)
-        books_db: List[BookORM] | None = result.scalars().all()
-        books: List[BookEntity] | None = [
-            BookMapper.to_entity(book) for book in books_db
-        ]
-        return books
+    def get_all_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> BookBatch:
+        stmt = paginate(select(*book_columns(fields)), limit, after_id)
+        return BookBatch.from_rows(self.session.execute(stmt), fields)
 
     def get_book_by_id(self, book_id: int) -> BookEntity:
         book_db = self.session.get(BookORM, book_id)
@@ -31,68 +65,198 @@ class SQLAlchemyBookRepository(BookRepositoryProtocol):
         else:
             raise BookDoesntExist(book_id)
 
-    def filter_books(self, **filters) -> List[BookEntity] | None:
-        stmt = select(BookORM)
-        if filters.get("title") is not None:
-            stmt = stmt.where(BookORM.title.ilike(f"%{filters['title']}%"))
-        if filters.get("min_pages") is not None:
-            stmt = stmt.where(BookORM.pages >= filters["min_pages"])
-        if filters.get("max_pages") is not None:
-            stmt = stmt.where(BookORM.pages <= filters["max_pages"])
-        if filters.get("min_rating") is not None:
-            stmt = stmt.where(BookORM.rating >= filters["min_rating"])
-        if filters.get("max_rating") is not None:
-            stmt = stmt.where(BookORM.rating <= filters["max_rating"])
-        if filters.get("min_price") is not None:
-            stmt = stmt.where(BookORM.price >= filters["min_price"])
-        if filters.get("max_price") is not None:
-            stmt = stmt.where(BookORM.price <= filters["max_price"])
-        books_db: List[BookORM] | None = self.session.scalars(stmt).all()
-        books: List[BookEntity] | None = [
-            BookMapper.to_entity(book) for book in books_db
-        ]
+    def get_books_by_ids(
+        self, book_ids: Sequence[int], chunk_size: int = ID_CHUNK_SIZE
+    ) -> BookBatch:
+        dialect = self.session.get_bind().dialect.name
+        ids = sorted(set(book_ids))
+        books = BookBatch()
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start : start + chunk_size]
+            stmt = (
+                select(*BOOK_COLUMNS)
+                .where(ids_match(chunk, dialect))
+                .order_by(BookORM.id)
+            )
+            for row in self.session.execute(stmt):
+                books.append(*row)
         return books
 
+    def filter_books(
+        self,
+        limit: int | None = None,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+        **filters,
+    ) -> BookBatch:
+        # plain column rows, no ORM identity map or per-row entity objects
+        stmt = apply_filters(select(*book_columns(fields)), filters)
+        stmt = order_and_paginate(stmt, filters, limit, after_id)
+        return BookBatch.from_rows(self.session.execute(stmt), fields)
+
+    def stream_books(self, batch_size: int = 1000, **filters) -> Iterator[BookEntity]:
+        # server-side cursor: rows are fetched and mapped batch_size at a time
+        stmt = apply_filters(select(BookORM), filters)
+        if filters.get("sort") is not None:
+            stmt = apply_sort(stmt, filters["sort"])
+        else:
+            stmt = stmt.order_by(BookORM.id)
+        result = self.session.execute(
+            stmt.execution_options(yield_per=batch_size, stream_results=True)
+        )
+        try:
+            for book_db in result.scalars():
+                yield BookMapper.to_entity(book_db)
+        finally:
+            result.close()
+
+    def get_book_statistics(
+        self, buckets: int = 10, top_authors: int = 10, **filters
+    ) -> dict:
+        return catalog_statistics(self.session, filters, buckets, top_authors)
+
     def add_book(self, book: BookEntity):
-        book_db = BookMapper.to_orm(book)
+        # one round trip: the database assigns the id and returns the stored row
+        stmt = (
+            insert(BookORM).values(**BookMapper.to_row(book)).returning(*BOOK_COLUMNS)
+        )
         try:
-            self.session.add(book_db)
+            row = self.session.execute(stmt).one()
+            if book.id is not None:
+                self._advance_id_sequence([book.id])
             self.session.commit()
-            self.session.refresh(book_db)
         except IntegrityError:
             self.session.rollback()
             raise BookAlreadyExists(book.id)
         except SQLAlchemyError:
             self.session.rollback()
             raise DatabaseError
-        return BookMapper.to_entity(book_db)
+        self.version.bump([row.id])
+        return BookEntity(**row._mapping)
 
-    def update_book(self, book_id: int, book_update_data: dict):
-        book_db = self.session.get(BookORM, book_id)
+    def add_books(
+        self, books: List[BookEntity], chunk_size: int = 1000
+    ) -> List[int | Exception]:
+        results: List[int | Exception | None] = [None] * len(books)
+        seen_ids = set()
+        for start in range(0, len(books), chunk_size):
+            positions = []
+            for position in range(start, min(start + chunk_size, len(books))):
+                book_id = books[position].id
+                if book_id is not None and book_id in seen_ids:
+                    results[position] = BookAlreadyExists(book_id)
+                    continue
+                seen_ids.add(book_id)
+                positions.append(position)
+            try:
+                self._insert_chunk(books, positions, results)
+                self.session.commit()
+            except SQLAlchemyError:
+                # a constraint failed somewhere in the chunk, isolate it row by row
+                self.session.rollback()
+                self._insert_rows(books, positions, results)
+            self.version.bump(
+                [results[p] for p in positions if isinstance(results[p], int)]
+            )
+        return results
 
-        if not book_db:
-            raise BookDoesntExist(book_id)
+    def _insert_ignoring_conflicts(self):
+        dialect = self.session.get_bind().dialect.name
+        if dialect not in CONFLICT_IGNORING_INSERTS:
+            return insert(BookORM)
+        return CONFLICT_IGNORING_INSERTS[dialect](BookORM).on_conflict_do_nothing(
+            index_elements=[BookORM.id]
+        )
+
+    def _insert_chunk(
+        self, books: List[BookEntity], positions: List[int], results: list
+    ) -> None:
+        rows = {position: BookMapper.to_row(books[position]) for position in positions}
+        with_id = [p for p in positions if "id" in rows[p]]
+        generated = [p for p in positions if "id" not in rows[p]]
+        if with_id:
+            stmt = self._insert_ignoring_conflicts().returning(BookORM.id)
+            inserted = set(self.session.scalars(stmt, [rows[p] for p in with_id]).all())
+            for position in with_id:
+                book_id = rows[position]["id"]
+                results[position] = (
+                    book_id if book_id in inserted else BookAlreadyExists(book_id)
+                )
+            self._advance_id_sequence(
+                [books[p].id for p in with_id if books[p].id in inserted]
+            )
+        if generated:
+            # keyed rows went first and moved the sequence past their ids, so
+            # the ids the database generates here cannot collide with them
+            stmt = insert(BookORM).returning(BookORM.id, sort_by_parameter_order=True)
+            new_ids = self.session.scalars(stmt, [rows[p] for p in generated]).all()
+            for position, book_id in zip(generated, new_ids):
+                results[position] = book_id
+
+    def _advance_id_sequence(self, explicit_ids: List[int]) -> None:
+        if explicit_ids and self.id_allocator.supports(self.session):
+            self.id_allocator.advance_past(self.session, max(explicit_ids))
+
+    def _insert_rows(
+        self, books: List[BookEntity], positions: List[int], results: list
+    ) -> None:
+        for position in positions:
+            try:
+                with self.session.begin_nested():
+                    self._insert_chunk(books, [position], results)
+            except SQLAlchemyError:
+                results[position] = DatabaseError()
+        self.session.commit()
 
-        for field, value in book_update_data.items():
-            if hasattr(book_db, field):
-                setattr(book_db, field, value)
+    def update_book(self, book_id: int, book_update_data: dict):
+        if not UPDATABLE_COLUMNS.intersection(book_update_data):
+            return self.get_book_by_id(book_id)
         try:
+            row = (
+                self.session.execute(update_returning(book_id, book_update_data))
+            ).one_or_none()
             self.session.commit()
-            self.session.refresh(book_db)
-        except DataError:  # db field constraint violated
+        except SQLAlchemyError:  # db field constraint violated
             self.session.rollback()
             raise DatabaseError
+        if row is None:
+            raise BookDoesntExist(book_id)
+        self.version.bump([book_id])
+        return BookEntity(**row._mapping)
 
-        return BookMapper.to_entity(book_db)
+    def reprice_books(
+        self, adjustment: dict, return_rows: bool = False, **filters
+    ) -> Tuple[int, List[BookEntity] | None]:
+        stmt = apply_filters(update(BookORM), filters).values(
+            price=adjusted_price(**adjustment)
+        )
+        if return_rows:
+            stmt = stmt.returning(BookORM)
+        try:
+            result = self.session.execute(
+                stmt, execution_options={"synchronize_session": False}
+            )
+            books = (
+                [BookMapper.to_entity(book) for book in result.scalars().all()]
+                if return_rows
+                else None
+            )
+            count = len(books) if return_rows else result.rowcount
+            self.session.commit()
+        except SQLAlchemyError:
+            self.session.rollback()
+            raise DatabaseError
+        # without returned rows the repriced ids are unknown, so all rows change
+        self.version.bump(None if books is None else [book.id for book in books])
+        return count, books
 
     def delete_book(self, book_id: int):
-        book_db = self.session.get(BookORM, book_id)
-        if not book_db:
-            raise BookDoesntExist(book_id)
-
         try:
-            self.session.delete(book_db)
+            deleted = (self.session.execute(delete_returning(book_id))).scalar()
             self.session.commit()
-        except SQLAlchemyError as e:
+        except SQLAlchemyError:
             self.session.rollback()
             raise DatabaseError
+        if deleted is None:
+            raise BookDoesntExist(book_id)
+        self.version.bump([book_id])
@@ -0,0 +1,188 @@
+import math
+from typing import Dict, List
+
+from sqlalchemy import Float, Integer, bindparam, cast, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.infrastructure.database.models.book_sqla import BookORM
+from app.infrastructure.repositories.queries import apply_filters
+
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+STAT_COLUMNS = {"price": BookORM.price, "rating": BookORM.rating}
+
+
+def _float(value) -> float | None:
+    # NUMERIC columns come back from PostgreSQL as Decimal
+    return None if value is None else float(value)
+
+
+def _percentile_name(fraction: float) -> str:
+    return f"p{fraction * 100:g}"
+
+
+def _summary(session, filters: dict) -> dict:
+    aggregates = [func.count()]
+    for column in STAT_COLUMNS.values():
+        aggregates += [
+            func.count(column),
+            func.min(column),
+            func.max(column),
+            func.avg(column),
+        ]
+    row = session.execute(
+        apply_filters(select(*aggregates).select_from(BookORM), filters)
+    ).one()
+    summary = {"count": row[0]}
+    for position, name in enumerate(STAT_COLUMNS):
+        present, low, high, mean = row[1 + position * 4 : 5 + position * 4]
+        summary[name] = {
+            "present": present,
+            "min": _float(low),
+            "max": _float(high),
+            "avg": _float(mean),
+        }
+    return summary
+
+
+def _percentiles_postgresql(session, filters: dict) -> Dict[str, List[float | None]]:
+    fractions = bindparam(None, list(PERCENTILES), type_=ARRAY(Float))
+    stmt = select(
+        *(
+            # one array argument, so the result is an array of the same length
+            type_coerce(
+                func.percentile_cont(fractions).within_group(cast(column, Float)),
+                ARRAY(Float),
+            )
+            for column in STAT_COLUMNS.values()
+        )
+    ).select_from(BookORM)
+    row = session.execute(apply_filters(stmt, filters)).one()
+    return {
+        name: list(values) if values is not None else [None] * len(PERCENTILES)
+        for name, values in zip(STAT_COLUMNS, row)
+    }
+
+
+def _percentiles_ranked(
+    session, filters: dict, column, present: int
+) -> List[float | None]:
+    # percentile_cont by hand: rank the values once, fetch the two neighbours
+    # of every percentile position and interpolate between them
+    if present == 0:
+        return [None] * len(PERCENTILES)
+    positions = [fraction * (present - 1) for fraction in PERCENTILES]
+    ranks = {
+        bound(position) for position in positions for bound in (math.floor, math.ceil)
+    }
+    ranked = apply_filters(
+        select(
+            column.label("value"),
+            (func.row_number().over(order_by=column) - 1).label("rank"),
+        ).where(column.is_not(None)),
+        filters,
+    ).subquery()
+    values = dict(
+        session.execute(
+            select(ranked.c.rank, ranked.c.value).where(ranked.c.rank.in_(ranks))
+        ).all()
+    )
+    result = []
+    for position in positions:
+        low, high = values[math.floor(position)], values[math.ceil(position)]
+        result.append(low + (high - low) * (position - math.floor(position)))
+    return result
+
+
+def _histogram(session, filters: dict, dialect: str, stats: dict, buckets: int):
+    low, high = stats["min"], stats["max"]
+    if stats["present"] == 0:
+        return []
+    if low == high:
+        return [{"lower": low, "upper": high, "count": stats["present"]}]
+    price = cast(BookORM.price, Float)
+    if dialect == "postgresql":
+        bucket = func.width_bucket(price, low, high, buckets).label("bucket")
+    else:
+        bucket = (cast((price - low) * buckets / (high - low), Integer) + 1).label(
+            "bucket"
+        )
+    stmt = apply_filters(
+        select(bucket, func.count()).where(BookORM.price.is_not(None)), filters
+    ).group_by(bucket)
+    counts = [0] * buckets
+    for number, count in session.execute(stmt):
+        # the maximum lands one past the last bucket, like width_bucket's
+        counts[min(max(number, 1), buckets) - 1] += count
+    width = (high - low) / buckets
+    return [
+        {
+            "lower": low + width * index,
+            "upper": high if index == buckets - 1 else low + width * (index + 1),
+            "count": count,
+        }
+        for index, count in enumerate(counts)
+    ]
+
+
+def _authors(session, filters: dict, limit: int) -> List[dict]:
+    if limit == 0:
+        return []
+    books = func.count().label("books")
+    stmt = apply_filters(
+        select(
+            BookORM.author,
+            books,
+            func.avg(BookORM.price),
+            func.avg(BookORM.rating),
+            func.min(BookORM.price),
+            func.max(BookORM.price),
+        ),
+        filters,
+    )
+    stmt = stmt.group_by(BookORM.author).order_by(books.desc(), BookORM.author)
+    return [
+        {
+            "author": author,
+            "count": count,
+            "avg_price": _float(avg_price),
+            "avg_rating": _float(avg_rating),
+            "min_price": _float(min_price),
+            "max_price": _float(max_price),
+        }
+        for author, count, avg_price, avg_rating, min_price, max_price in (
+            session.execute(stmt.limit(limit))
+        )
+    ]
+
+
+def catalog_statistics(
+    session, filters: dict, buckets: int = 10, top_authors: int = 10
+) -> dict:
+    dialect = session.get_bind().dialect.name
+    summary = _summary(session, filters)
+    if dialect == "postgresql":
+        percentiles = _percentiles_postgresql(session, filters)
+    else:
+        percentiles = {
+            name: _percentiles_ranked(
+                session, filters, column, summary[name]["present"]
+            )
+            for name, column in STAT_COLUMNS.items()
+        }
+    result = {"count": summary["count"]}
+    for name in STAT_COLUMNS:
+        stats = summary[name]
+        result[name] = {
+            "min": stats["min"],
+            "max": stats["max"],
+            "avg": stats["avg"],
+            "percentiles": {
+                _percentile_name(fraction): _float(value)
+                for fraction, value in zip(PERCENTILES, percentiles[name])
+            },
+        }
+    result["price_histogram"] = _histogram(
+        session, filters, dialect, summary["price"], buckets
+    )
+    result["authors"] = _authors(session, filters, top_authors)
+    return result
@@ -0,0 +1,44 @@
+import functools
+import inspect
+import time
+
+from app.infrastructure.metrics.app_metrics import REPOSITORY_LATENCY
+
+
+# wraps sync and async repositories alike; generator methods such as
+# stream_books are timed until the iterator is returned, not until exhausted
+class TimedBookRepository:
+    def __init__(self, repository, name: str | None = None):
+        self.repository = repository
+        self.name = name or type(repository).__name__
+
+    def __getattr__(self, attribute):
+        target = getattr(self.repository, attribute)
+        if attribute.startswith("_") or not callable(target):
+            return target
+
+        if inspect.iscoroutinefunction(target):
+
+            @functools.wraps(target)
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await target(*args, **kwargs)
+                finally:
+                    REPOSITORY_LATENCY.observe(
+                        self.name, attribute, value=time.perf_counter() - start
+                    )
+
+        else:
+
+            @functools.wraps(target)
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return target(*args, **kwargs)
+                finally:
+                    REPOSITORY_LATENCY.observe(
+                        self.name, attribute, value=time.perf_counter() - start
+                    )
+
+        return timed
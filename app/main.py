@@ -1,8 +1,49 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, APIRouter
+from fastapi.middleware.gzip import GZipMiddleware
 
+from .api.dependencies import catalog_index
+from .api.profiling import ProfilingMiddleware
 from .api.routers.books import router as books_router
+from .api.routers.metrics import router as metrics_router
+from .config import settings
+from .infrastructure.database.session import SessionLocal
+from .infrastructure.log.queue_logging import configure_logging, parse_sample_rates
+from .infrastructure.repositories.sqlalchemy_book_repository import (
+    SQLAlchemyBookRepository,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_listener = configure_logging(
+        settings.log_level,
+        parse_sample_rates(settings.log_route_sample_rates),
+        settings.log_sample_rate,
+    )
+    if catalog_index is not None:
+        with SessionLocal() as db:
+            catalog_index.refresh(SQLAlchemyBookRepository(db).get_all_books)
+    yield
+    log_listener.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+# list responses negotiate and precompress their own encoding, this covers the
+# rest (exports, bulk results); it skips responses that already have one
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
 
-app = FastAPI()
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.profile_dir,
+        token=settings.profile_token,
+        sample_rate=settings.profile_sample_rate,
+        profile_format=settings.profile_format,
+        interval=settings.profile_interval,
+    )
 
 
 app.include_router(books_router)
+app.include_router(metrics_router)
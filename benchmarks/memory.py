@@ -0,0 +1,74 @@
+"""Memory held by a list result: dict-based entities vs slotted entities vs BookBatch.
+
+python -m benchmarks.memory --rows 1000000
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+
+
+class DictBookEntity:
+    # the BookEntity layout before __slots__, kept here for comparison
+    def __init__(self, id, title, author, pages, price, rating):
+        self.id = id
+        self.title = title
+        self.author = author
+        self.pages = pages
+        self.price = price
+        self.rating = rating
+
+
+def make_rows(count: int):
+    # fresh str objects per row, the way a database driver returns them
+    return [
+        (
+            i,
+            f"Book title number {i}",
+            f"Author {i % 500}",
+            random.randint(50, 1200),
+            round(random.uniform(0, 5), 1),
+            round(random.uniform(1, 200), 2),
+        )
+        for i in range(count)
+    ]
+
+
+def measure(name: str, build, count: int) -> None:
+    # rows are created and dropped inside the trace, so the number is what the
+    # result keeps alive: entities retain every str/int/float object of a row,
+    # the batch keeps unboxed numbers and interned strings
+    gc.collect()
+    tracemalloc.start()
+    rows = make_rows(count)
+    result = build(rows)
+    del rows
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<16} {current / 2**20:>9.1f} MiB  {current / count:>7.1f} B/row")
+    del result
+
+
+def main(args):
+    measure(
+        "dict entities",
+        lambda rows: [DictBookEntity(i, t, a, p, pr, r) for i, t, a, p, r, pr in rows],
+        args.rows,
+    )
+    measure(
+        "slotted entities",
+        lambda rows: [BookEntity(i, t, a, p, pr, r) for i, t, a, p, r, pr in rows],
+        args.rows,
+    )
+    measure("BookBatch", BookBatch.from_rows, args.rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    main(parser.parse_args())
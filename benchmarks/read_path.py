@@ -0,0 +1,86 @@
+"""Rows/sec of the list read path: ORM + entities + BookAPI vs BookBatch + to_json.
+
+python -m benchmarks.read_path --rows 100000
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.models import BookAPI
+from app.infrastructure.database.base import Base
+from app.infrastructure.database.models.book_sqla import BookORM
+from app.infrastructure.mappers.book_mapper import BookMapper
+from app.infrastructure.repositories.sqlalchemy_book_repository import (
+    SQLAlchemyBookRepository,
+)
+
+response_adapter = TypeAdapter(List[BookAPI])
+
+
+def seed(session, rows: int) -> None:
+    session.execute(
+        insert(BookORM),
+        [
+            {
+                "title": f"Book {i}",
+                "author": f"Author {i % 500}",
+                "pages": random.randint(50, 1200),
+                "rating": round(random.uniform(0, 5), 1),
+                "price": round(random.uniform(1, 200), 2),
+            }
+            for i in range(rows)
+        ],
+    )
+    session.commit()
+
+
+def orm_path(repo: SQLAlchemyBookRepository) -> bytes:
+    # what the handlers did before: entities, BookAPI, then FastAPI's
+    # response_model validation and jsonable_encoder + json.dumps
+    entities = [
+        BookMapper.to_entity(book) for book in repo.session.scalars(select(BookORM))
+    ]
+    books = [BookAPI.model_validate(book.to_dict()) for book in entities]
+    validated = response_adapter.validate_python(books, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def rows_path(repo: SQLAlchemyBookRepository) -> bytes:
+    return to_json(repo.get_all_books().to_dicts())
+
+
+def measure(name: str, path, repo, rows: int, repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        repo.session.expunge_all()
+        started = time.perf_counter()
+        path(repo)
+        best = min(best, time.perf_counter() - started)
+    print(f"{name:<10} {rows / best:>12,.0f} rows/s ({best * 1000:.1f} ms)")
+
+
+def main(args):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    seed(session, args.rows)
+    repo = SQLAlchemyBookRepository(session)
+
+    measure("orm", orm_path, repo, args.rows, args.repeat)
+    measure("rows", rows_path, repo, args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
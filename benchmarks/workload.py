@@ -0,0 +1,183 @@
+"""Replay an HTTP workload against a running app and report latency per route.
+
+python -m benchmarks.workload generate --requests 20000 --max-id 100000 -o workload.ndjson
+python -m benchmarks.workload run workload.ndjson --base-url http://localhost:8080 --concurrency 64
+
+A workload file holds one request per line, for example
+{"route": "GET /books/{book_id}", "method": "GET", "path": "/books/42"}
+{"route": "GET /books", "method": "GET", "path": "/books", "params": {"min_price": 10}}
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.catalog import generate_books
+
+DEFAULT_MIX = {"get": 60, "filter": 25, "post": 10, "put": 5}
+
+
+def _filter_params(rng: random.Random) -> dict:
+    low_price = round(rng.uniform(1, 40), 2)
+    candidates = [
+        {"min_price": low_price, "max_price": round(low_price + rng.uniform(1, 10), 2)},
+        {"min_pages": rng.randint(40, 800), "max_rating": round(rng.uniform(2, 5), 1)},
+        {"min_rating": round(rng.uniform(3, 5), 1), "limit": 50},
+        {"title": rng.choice(["night", "river", "empire", "garden"]), "limit": 50},
+    ]
+    return rng.choice(candidates)
+
+
+def generate_workload(requests: int, max_id: int, mix: Dict[str, int], seed: int = 0):
+    rng = random.Random(seed)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    new_books = generate_books(requests, seed=seed + 1, first_id=max_id + 1)
+    for kind in kinds:
+        if kind == "get":
+            path = f"/books/{rng.randint(1, max_id)}"
+            yield {"route": "GET /books/{book_id}", "method": "GET", "path": path}
+        elif kind == "filter":
+            params = _filter_params(rng)
+            yield {
+                "route": "GET /books",
+                "method": "GET",
+                "path": "/books",
+                "params": params,
+            }
+        elif kind == "post":
+            book = next(new_books)
+            book.pop("id")
+            yield {
+                "route": "POST /books",
+                "method": "POST",
+                "path": "/books",
+                "json": book,
+            }
+        else:
+            book_id = rng.randint(1, max_id)
+            body = {"price": round(rng.uniform(1, 100), 2)}
+            yield {
+                "route": "PUT /books/{book_id}",
+                "method": "PUT",
+                "path": f"/books/{book_id}",
+                "json": body,
+            }
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    position = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[position]
+
+
+async def replay(records: List[dict], base_url: str, concurrency: int, timeout: float):
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    queue: asyncio.Queue = asyncio.Queue()
+    for record in records:
+        queue.put_nowait(record)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=timeout
+    ) as client:
+
+        async def worker():
+            while not queue.empty():
+                record = queue.get_nowait()
+                route = record.get("route", f"{record['method']} {record['path']}")
+                started = time.perf_counter()
+                try:
+                    response = await client.request(
+                        record["method"],
+                        record["path"],
+                        params=record.get("params"),
+                        json=record.get("json"),
+                    )
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies[route].append(time.perf_counter() - started)
+                statuses[route][status] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return elapsed, latencies, statuses
+
+
+def report(elapsed: float, latencies: dict, statuses: dict) -> None:
+    total = sum(len(values) for values in latencies.values())
+    print(f"{total:,} requests in {elapsed:.2f} s, {total / elapsed:,.0f} req/s")
+    print(
+        f"{'route':<24} {'count':>8} {'req/s':>8} {'mean ms':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses"
+    )
+    for route in sorted(latencies):
+        values = sorted(latencies[route])
+        millis = [statistics.fmean(values)] + [
+            percentile(values, fraction) for fraction in (0.5, 0.95, 0.99)
+        ]
+        codes = " ".join(f"{code}:{n}" for code, n in sorted(statuses[route].items()))
+        print(
+            f"{route:<24} {len(values):>8} {len(values) / elapsed:>8.0f} "
+            + " ".join(f"{value * 1000:>8.1f}" for value in millis)
+            + f"  {codes}"
+        )
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        kind, weight = part.split("=")
+        if kind not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown request kind: {kind}")
+        mix[kind] = int(weight)
+    return mix
+
+
+def main(args):
+    if args.command == "generate":
+        with open(args.output, "w") as output:
+            for record in generate_workload(
+                args.requests, args.max_id, args.mix, args.seed
+            ):
+                output.write(json.dumps(record) + "\n")
+        return
+    with open(args.workload) as workload:
+        records = [json.loads(line) for line in workload if line.strip()]
+    records = records * args.repeat
+    report(*asyncio.run(replay(records, args.base_url, args.concurrency, args.timeout)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="write a synthetic workload file")
+    generate.add_argument("--requests", type=int, default=10_000)
+    generate.add_argument("--max-id", type=int, default=100_000)
+    generate.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="e.g. get=60,filter=25,post=10,put=5",
+    )
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("-o", "--output", default="workload.ndjson")
+
+    run = commands.add_parser("run", help="replay a workload file")
+    run.add_argument("workload")
+    run.add_argument("--base-url", default="http://localhost:8080")
+    run.add_argument("--concurrency", type=int, default=32)
+    run.add_argument("--repeat", type=int, default=1)
+    run.add_argument("--timeout", type=float, default=10.0)
+    main(parser.parse_args())
@@ -7,6 +7,17 @@ CREATE TABLE books (
     price NUMERIC(6,2) CHECK (price >= 0)
 );
 
+-- keep in sync with app/infrastructure/database/migrations
+CREATE INDEX ix_books_rating_price ON books (rating, price);
+CREATE INDEX ix_books_price_id ON books (price, id);
+CREATE INDEX ix_books_rating_id ON books (rating, id);
+CREATE INDEX ix_books_pages_id ON books (pages, id);
+CREATE INDEX ix_books_title_id ON books (title, id);
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX ix_books_title_trgm ON books USING gin (title gin_trgm_ops);
+CREATE INDEX ix_books_title_fts ON books USING gin (to_tsvector('english', title));
+
 INSERT INTO books (title, author, pages, rating, price) VALUES
 ('To Kill a Mockingbird', 'Harper Lee', 324, 4.8, 14.99),
 ('1984', 'George Orwell', 328, 4.7, 12.95),
@@ -0,0 +1,42 @@
+from app.api.dependencies import get_book_repository
+from app.infrastructure.index.catalog_index import CatalogIndex
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
+from app.infrastructure.repositories.caching_book_repository import (
+    CachingBookRepository,
+)
+from app.infrastructure.repositories.indexed_book_repository import (
+    IndexedBookRepository,
+)
+from app.infrastructure.repositories.sqlalchemy_book_repository import (
+    SQLAlchemyBookRepository,
+)
+from app.infrastructure.repositories.timed_book_repository import (
+    TimedBookRepository,
+)
+
+
+def test_get_book_repository_wrapping_order(filled_db):
+    repository = get_book_repository(
+        filled_db, LRUTTLCache(), LRUTTLCache(), CatalogIndex()
+    )
+
+    layers = [repository, repository.repository, repository.repository.repository]
+    assert [type(layer) for layer in layers] == [
+        CachingBookRepository,
+        IndexedBookRepository,
+        TimedBookRepository,
+    ]
+    assert isinstance(layers[-1].repository, SQLAlchemyBookRepository)
+
+
+def test_reads_and_writes_through_production_wiring(wired_client):
+    filtered = wired_client.get("/books", params={"min_price": 11})
+    assert sorted(book["id"] for book in filtered.json()) == [1, 2]
+
+    updated = wired_client.put("/books/3", json={"price": 20.0})
+    assert updated.status_code == 200
+
+    # the async per-book route and the indexed, cached filter both see it
+    assert wired_client.get("/books/3").json()["price"] == 20.0
+    filtered = wired_client.get("/books", params={"min_price": 11})
+    assert sorted(book["id"] for book in filtered.json()) == [1, 2, 3]
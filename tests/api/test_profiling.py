@@ -0,0 +1,90 @@
+import pstats
+import threading
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.profiling import (
+    PROFILE_FILE_HEADER,
+    PROFILE_TOKEN_HEADER,
+    ProfiledRoute,
+    ProfilingMiddleware,
+)
+from app.infrastructure.profiling.profilers import PROFILERS
+
+
+def make_client(tmp_path, **options):
+    profiled = FastAPI()
+    router = APIRouter(route_class=ProfiledRoute)
+
+    @router.get("/work")
+    def work():
+        return {"total": sum(range(100_000)), "thread": threading.get_ident()}
+
+    profiled.include_router(router)
+    profiled.add_middleware(ProfilingMiddleware, directory=str(tmp_path), **options)
+    return TestClient(profiled)
+
+
+def test_requests_without_token_are_not_profiled(tmp_path):
+    client = make_client(tmp_path, token="secret")
+    response = client.get("/work", headers={PROFILE_TOKEN_HEADER: "wrong"})
+
+    assert response.status_code == 200
+    assert PROFILE_FILE_HEADER not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_token_writes_collapsed_stacks(tmp_path):
+    client = make_client(tmp_path, token="secret", interval=0.0005)
+    response = client.get("/work", headers={PROFILE_TOKEN_HEADER: "secret"})
+
+    name = response.headers[PROFILE_FILE_HEADER]
+    assert name.endswith(".collapsed")
+    for line in (tmp_path / name).read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert ";" in stack
+
+
+def test_sampled_requests_write_pstats(tmp_path):
+    client = make_client(tmp_path, sample_rate=1.0, profile_format="pstats")
+    response = client.get("/work")
+
+    name = response.headers[PROFILE_FILE_HEADER]
+    stats = pstats.Stats(str(tmp_path / name))
+    assert any(function == "work" for _, _, function in stats.stats)
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(KeyError):
+        make_client(tmp_path, sample_rate=1.0, profile_format="svg").get("/work")
+
+
+def test_profiler_follows_the_request_threads(tmp_path, monkeypatch):
+    seen = []
+
+    class ThreadRecorder:
+        suffix = "threads"
+
+        def __init__(self, interval, threads):
+            self.threads = threads
+            seen.append(threads)
+
+        def start(self):
+            pass
+
+        def stop(self):
+            pass
+
+        def write(self, path):
+            pass
+
+    monkeypatch.setitem(PROFILERS, "threads", ThreadRecorder)
+    client = make_client(tmp_path, sample_rate=1.0, profile_format="threads")
+    response = client.get("/work")
+
+    [threads] = seen
+    assert response.json()["thread"] in threads
+    assert len(threads) == 2
@@ -1,8 +1,17 @@
+import csv
+import io
+import json
 from http.client import HTTPException
 
 import pytest
 from starlette.status import HTTP_404_NOT_FOUND
 
+from app.api import bulk
+from app.api.dependencies import get_async_book_service
+from app.api.models import BookAPI
+from app.domain.entities.book import MAX_PRICE
+from app.main import app
+
 
 def test_get_health(client):
     response = client.get("/health")
@@ -48,3 +57,426 @@ def test_delete_book(client):
     # get all books
     response = client.get("/books")
     assert len(response.json()) == 2
+
+
+def test_get_books_paginated(client):
+    response = client.get("/books", params={"limit": 2})
+    assert response.status_code == 200
+    assert [book["id"] for book in response.json()] == [1, 2]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get("/books", params={"limit": 2, "cursor": cursor})
+    assert [book["id"] for book in response.json()] == [3]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_books_invalid_cursor(client):
+    response = client.get("/", params={"limit": 2, "cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_export_books_ndjson(client):
+    response = client.get("/books/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+
+
+def test_export_books_csv_filtered(client):
+    response = client.get("/books/export", params={"format": "csv", "min_pages": 400})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Dune"]
+
+
+def test_get_book_by_id_after_update_is_fresh(client):
+    client.get("/books/1")
+    response = client.put("/books/1", json={"author": "Eric Blair"})
+    assert response.status_code == 200
+
+    response = client.get("/books/1")
+    assert response.json()["author"] == "Eric Blair"
+
+
+def test_filter_books_not_stale_after_delete(client):
+    response = client.get("/books", params={"min_pages": 300})
+    assert len(response.json()) == 3
+
+    client.delete("/books/2")
+    response = client.get("/books", params={"min_pages": 300})
+    assert sorted(book["id"] for book in response.json()) == [1, 3]
+
+
+def test_add_books_bulk_reports_conflicts_and_errors(client, item_to_add):
+    payload = [
+        item_to_add.model_dump(),
+        {**item_to_add.model_dump(), "id": 1},
+        {"title": "Missing fields"},
+    ]
+    response = client.post("/books/bulk", json=payload)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["ids"] == [4]
+    assert [conflict["index"] for conflict in result["conflicts"]] == [1]
+    assert [error["index"] for error in result["errors"]] == [2]
+
+    response = client.get("/books")
+    assert len(response.json()) == 4
+
+
+def test_add_books_bulk_ndjson(client, item_to_add):
+    lines = [
+        json.dumps({**item_to_add.model_dump(), "id": book_id}) for book_id in (5, 6)
+    ]
+    response = client.post(
+        "/books/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.json()["ids"] == [5, 6]
+
+
+def test_add_books_bulk_ndjson_split_across_chunks(client, item_to_add):
+    body = "\n".join(
+        json.dumps({**item_to_add.model_dump(), "id": book_id}) for book_id in (5, 6)
+    ).encode()
+    response = client.post(
+        "/books/bulk",
+        content=iter([body[:7], body[7:-5], body[-5:]]),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.json()["ids"] == [5, 6]
+
+
+def test_add_books_bulk_ndjson_refuses_too_many_rows(client, item_to_add, monkeypatch):
+    monkeypatch.setattr(bulk, "MAX_BULK_ROWS", 1)
+    lines = [json.dumps(item_to_add.model_dump())] * 2
+    response = client.post(
+        "/books/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 413
+
+
+def test_add_books_bulk_refuses_oversized_body(client, item_to_add, monkeypatch):
+    monkeypatch.setattr(bulk, "MAX_BULK_BYTES", 10)
+    response = client.post("/books/bulk", json=[item_to_add.model_dump()])
+    assert response.status_code == 413
+
+    response = client.post(
+        "/books/bulk",
+        content=iter([b"[", json.dumps(item_to_add.model_dump()).encode(), b"]"]),
+    )
+    assert response.status_code == 413
+
+
+def test_reprice_books(client):
+    response = client.post(
+        "/books/reprice",
+        json={
+            "filter": {"max_price": 13},
+            "adjustment": {"mode": "set", "value": 9.99},
+            "return_rows": True,
+        },
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["updated"] == 2
+    assert {book["id"]: book["price"] for book in result["books"]} == {
+        1: 9.99,
+        3: 9.99,
+    }
+
+    response = client.get("/books/1")
+    assert response.json()["price"] == 9.99
+
+
+@pytest.mark.parametrize("value", [-5, 10_000])
+def test_reprice_rejects_out_of_range_set_price(client, value):
+    response = client.post(
+        "/books/reprice",
+        json={
+            "filter": {"max_price": 13},
+            "adjustment": {"mode": "set", "value": value},
+        },
+    )
+    assert response.status_code == 422
+
+
+def test_reprice_whole_catalog_needs_all_flag(client):
+    adjustment = {"mode": "percent", "value": 10}
+
+    refused = client.post("/books/reprice", json={"adjustment": adjustment})
+    sorted_only = client.post(
+        "/books/reprice", json={"filter": {"sort": "price"}, "adjustment": adjustment}
+    )
+    allowed = client.post(
+        "/books/reprice", json={"adjustment": adjustment, "all": True}
+    )
+
+    assert refused.status_code == 422
+    assert sorted_only.status_code == 422
+    assert allowed.status_code == 200
+    assert allowed.json()["updated"] == 3
+
+
+@pytest.mark.parametrize(
+    "book_filter",
+    [
+        {"title": ""},
+        {"title": "   "},
+        {"min_price": 0, "max_price": MAX_PRICE},
+        {"min_rating": 0, "max_rating": 5, "min_pages": 0},
+    ],
+)
+def test_reprice_filter_matching_everything_needs_all_flag(client, book_filter):
+    response = client.post(
+        "/books/reprice",
+        json={"filter": book_filter, "adjustment": {"mode": "percent", "value": 10}},
+    )
+
+    assert response.status_code == 422
+    assert client.get("/books/1").json()["price"] == 12.95
+
+
+def test_filter_books_fulltext_rejects_cursor(client):
+    response = client.get(
+        "/books",
+        params={"title": "dune", "search_mode": "fulltext", "cursor": "eyJpZCI6MX0"},
+    )
+    assert response.status_code == 400
+
+
+def test_get_all_books_matches_book_schema(client):
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    books = [BookAPI.model_validate(book) for book in response.json()]
+    assert sorted(book.id for book in books) == [1, 2, 3]
+
+
+def test_get_pool_health(client):
+    response = client.get("/health/pool")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"sync", "async"}
+    assert "wait_seconds_avg" in response.json()["sync"]
+
+
+def test_metrics_exposition(client):
+    client.get("/books/1")
+    client.get("/books/100")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/books/{book_id}",'
+        'status="404"}' in body
+    )
+    assert 'http_requests_in_flight{method="GET",route="/books/{book_id}"} 0' in body
+    assert (
+        'http_request_sql_queries_count{method="GET",route="/books/{book_id}"}' in body
+    )
+    assert (
+        'repository_call_duration_seconds_count{repository="AsyncSQLAlchemyBookRepository",'
+        'method="get_book_by_id"}' in body
+    )
+    assert "# TYPE db_pool_checkout_timeouts counter" in body
+    assert 'db_pool_checkout_timeouts_total{engine="sync"}' in body
+    assert "# TYPE cache_misses counter" in body
+    assert 'cache_misses_total{cache="book"}' in body
+    assert 'cache_entries{cache="snapshot"}' in body
+    assert 'cache_weight{cache="snapshot"}' in body
+    assert 'db_pool_connections{engine="sync",state="idle"}' in body
+
+
+def test_list_etag_returns_304_until_catalog_changes(client, item_to_update):
+    first = client.get("/")
+    etag = first.headers["ETag"]
+
+    cached = client.get("/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert client.get("/books", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put("/books/2", json=item_to_update.model_dump(exclude_unset=True))
+    assert client.get("/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_book_etag_tracks_its_own_row(client, item_to_update):
+    etag = client.get("/books/1").headers["ETag"]
+    assert client.get("/books/1", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put("/books/2", json=item_to_update.model_dump(exclude_unset=True))
+    assert client.get("/books/1", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put("/books/1", json=item_to_update.model_dump(exclude_unset=True))
+    response = client.get("/books/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["author"] == "Update Author"
+
+
+def test_not_modified_skips_the_service(client):
+    etag = client.get("/books/1").headers["ETag"]
+    app.dependency_overrides[get_async_book_service] = lambda: None
+    try:
+        response = client.get("/books/1", headers={"If-None-Match": f"W/{etag}"})
+    finally:
+        del app.dependency_overrides[get_async_book_service]
+    assert response.status_code == 304
+
+
+def test_wildcard_if_none_match_needs_an_existing_book(client):
+    assert client.get("/books/1", headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get("/books/99999", headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_list_responses_are_served_from_compressed_snapshots(client, snapshot_cache):
+    first = client.get("/", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["vary"] == "Accept-Encoding"
+    assert first.json() == second.json()
+    assert len(first.json()) == 3
+    assert len(snapshot_cache) == 1
+
+
+def test_snapshots_are_rebuilt_after_a_write(client, item_to_update):
+    client.get("/books", params={"min_pages": 1}, headers={"Accept-Encoding": "gzip"})
+    client.put("/books/1", json=item_to_update.model_dump(exclude_unset=True))
+    response = client.get(
+        "/books", params={"min_pages": 1}, headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert {book["author"] for book in response.json()} >= {"Update Author"}
+
+
+def test_list_identity_encoding(client):
+    response = client.get("/", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert len(response.json()) == 3
+
+
+def test_encodings_get_distinct_etags(client):
+    gzip_etag = client.get("/", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    plain = client.get(
+        "/", headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag}
+    )
+
+    assert plain.status_code == 200
+    assert plain.headers["ETag"] != gzip_etag
+
+
+@pytest.mark.parametrize("path", ["/", "/books", "/books/stats"])
+def test_not_modified_varies_by_encoding(client, path):
+    etag = client.get(path).headers["ETag"]
+    cached = client.get(path, headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304
+    assert cached.headers["Vary"] == "Accept-Encoding"
+
+
+def test_add_book_without_id_uses_database_id(client, item_to_add):
+    payload = item_to_add.model_dump(exclude={"id"})
+    first = client.post("/books", json=payload)
+    second = client.post("/books", json=payload)
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert (first.json()["id"], second.json()["id"]) == (4, 5)
+
+
+def test_batch_get_reports_missing_ids(client):
+    response = client.post("/books/batch-get", json={"ids": [3, 100, 1, 3, 200]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [book["id"] for book in body["books"]] == [1, 3]
+    assert body["missing"] == [100, 200]
+
+
+def test_batch_get_rejects_empty_list(client):
+    assert client.post("/books/batch-get", json={"ids": []}).status_code == 422
+
+
+def test_filter_books_sorted_top_k(client):
+    response = client.get("/books", params={"sort": "-rating", "limit": 2})
+
+    assert response.status_code == 200
+    assert [book["id"] for book in response.json()] == [3, 2]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_filter_books_sorted_rejects_cursor(client):
+    response = client.get("/books", params={"sort": "price", "cursor": "eyJpZCI6MX0"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("sort", ["author", "price,", "+price", "price;rating"])
+def test_filter_books_invalid_sort(client, sort):
+    response = client.get("/books", params={"sort": sort})
+    assert response.status_code == 422
+
+
+def test_list_endpoints_project_fields(client):
+    listed = client.get("/", params={"fields": "price", "limit": 1})
+    filtered = client.get("/books", params={"fields": "rating,id", "sort": "-rating"})
+
+    assert listed.json() == [{"id": 1, "price": 12.95}]
+    assert filtered.json()[0] == {"id": 3, "rating": 4.9}
+
+
+def test_get_book_by_id_projects_fields(client):
+    response = client.get("/books/2", params={"fields": "title"})
+
+    assert response.status_code == 200
+    assert response.json() == {"id": 2, "title": "Dune"}
+    assert "ETag" in response.headers
+
+
+def test_fields_rejects_unknown_names(client):
+    response = client.get("/books", params={"fields": "id,isbn"})
+    assert response.status_code == 422
+
+
+def test_get_book_statistics(client):
+    response = client.get("/books/stats", params={"max_price": 13, "buckets": 4})
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["count"] == 2
+    assert stats["price"]["avg"] == pytest.approx(11.97)
+    assert len(stats["price_histogram"]) == 4
+    assert {author["author"] for author in stats["authors"]} == {
+        "George Orwell",
+        "Tolkien",
+    }
+
+    cached = client.get(
+        "/books/stats", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert cached.status_code == 304
+
+
+def test_get_book_statistics_etag_per_encoding(client):
+    gzipped = client.get("/books/stats", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/books/stats", headers={"Accept-Encoding": "identity"})
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["ETag"] != identity.headers["ETag"]
+    assert gzipped.json() == identity.json()
+
+
+def test_get_book_statistics_validates_buckets(client):
+    response = client.get("/books/stats", params={"buckets": 0})
+    assert response.status_code == 422
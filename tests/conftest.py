@@ -4,16 +4,30 @@ from unittest.mock import Mock
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-
-from app.api.dependencies import get_book_service
+from sqlalchemy.pool import NullPool
+
+from app.api.dependencies import (
+    get_book_service,
+    get_book_cache,
+    get_catalog_index,
+    get_filter_cache,
+    get_snapshot_cache,
+)
 from app.application.services.book_service import BookService
+from app.config import Settings
+from app.infrastructure.index.catalog_index import CatalogIndex
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
 from app.infrastructure.database.base import Base
 from app.infrastructure.database.models.book_sqla import BookORM
-from app.infrastructure.database.session import get_db
+from app.infrastructure.database.session import get_db, get_async_db
 from app.api.models import BookAPI, BookUpdate
 from app.domain.entities.book import BookEntity
 from app.domain.repositories.book_repository_protocol import BookRepositoryProtocol
+from app.infrastructure.repositories.caching_book_repository import (
+    CachingBookRepository,
+)
 from app.infrastructure.repositories.sqlalchemy_book_repository import (
     SQLAlchemyBookRepository,
 )
@@ -89,31 +103,103 @@ def filled_db(in_memory_db):
     return in_memory_db
 
 
+@pytest.fixture()
+def async_session_factory(filled_db):
+    # NullPool: each TestClient request runs on its own event loop
+    engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
 @pytest.fixture()
 def sqlalchemy_repo(filled_db):
     return SQLAlchemyBookRepository(filled_db)
 
 
+@pytest.fixture()
+def book_cache():
+    return LRUTTLCache(maxsize=100, ttl=60)
+
+
+@pytest.fixture()
+def filter_cache():
+    return LRUTTLCache(maxsize=100, ttl=60)
+
+
+@pytest.fixture()
+def snapshot_cache():
+    return LRUTTLCache(maxsize=10, ttl=60)
+
+
 @pytest.fixture
-def book_service(sqlalchemy_repo):
-    return BookService(sqlalchemy_repo)
+def book_service(sqlalchemy_repo, book_cache, filter_cache):
+    return BookService(CachingBookRepository(sqlalchemy_repo, book_cache, filter_cache))
 
 
 @pytest.fixture()
-def client(filled_db, sqlalchemy_repo, book_service):
+def client(
+    filled_db,
+    sqlalchemy_repo,
+    book_service,
+    book_cache,
+    filter_cache,
+    snapshot_cache,
+    async_session_factory,
+):
     def override_get_db():
         yield filled_db
 
-    def override_get_book_repository():
-        return sqlalchemy_repo
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
 
     def override_get_book_service():
         return book_service
 
-    app.dependency_overrides[get_db] = override_get_db()
+    app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_book_service] = override_get_book_service
-    app.dependency_overrides[get_db] = override_get_book_repository
-    return TestClient(app)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_book_cache] = lambda: book_cache
+    app.dependency_overrides[get_filter_cache] = lambda: filter_cache
+    app.dependency_overrides[get_snapshot_cache] = lambda: snapshot_cache
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def wired_client(filled_db, book_cache, filter_cache, snapshot_cache, monkeypatch):
+    # only the sessions and the process-wide caches are swapped out, the
+    # repositories are built by the production dependencies; the URLs go
+    # through Settings so the async driver is picked the way the app picks it
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///./test.db")
+    monkeypatch.delenv("ASYNC_DATABASE_URL", raising=False)
+    settings = Settings.from_env()
+    engine = create_engine(
+        settings.database_url, connect_args={"check_same_thread": False}
+    )
+    async_engine = create_async_engine(settings.async_database_url, poolclass=NullPool)
+    session_factory = sessionmaker(bind=engine)
+    async_session_factory = async_sessionmaker(
+        bind=async_engine, expire_on_commit=False
+    )
+
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    index = CatalogIndex()
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_book_cache] = lambda: book_cache
+    app.dependency_overrides[get_filter_cache] = lambda: filter_cache
+    app.dependency_overrides[get_snapshot_cache] = lambda: snapshot_cache
+    app.dependency_overrides[get_catalog_index] = lambda: index
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    engine.dispose()
 
 
 @pytest.fixture()
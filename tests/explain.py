@@ -0,0 +1,25 @@
+import re
+
+from sqlalchemy import text
+
+
+def query_plan(connection, stmt) -> str:
+    sql = str(
+        stmt.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    )
+    if connection.dialect.name == "postgresql":
+        # tiny test tables always favour seq scans, check the index is usable
+        with connection.begin_nested():
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+            rows = connection.exec_driver_sql(f"EXPLAIN {sql}").all()
+        return "\n".join(row[0] for row in rows)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def assert_uses_index(connection, stmt, *index_names: str) -> None:
+    plan = query_plan(connection, stmt)
+    # whole names only, ix_books_price must not match ix_books_price_id
+    assert any(
+        re.search(rf"\b{re.escape(name)}\b", plan) for name in index_names
+    ), f"expected one of {index_names} in plan:\n{plan}"
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from app.domain.exceptions import BookDoesntExist
+from app.infrastructure.repositories.async_sqlalchemy_book_repository import (
+    AsyncSQLAlchemyBookRepository,
+)
+
+
+def run_with_repo(session_factory, action):
+    async def run():
+        async with session_factory() as session:
+            return await action(AsyncSQLAlchemyBookRepository(session))
+
+    return asyncio.run(run())
+
+
+def test_get_book_by_id(async_session_factory):
+    result = run_with_repo(async_session_factory, lambda repo: repo.get_book_by_id(1))
+
+    assert result.title == "1984"
+
+
+def test_get_book_by_id_nonexisting(async_session_factory):
+    book_id = 100
+    with pytest.raises(BookDoesntExist):
+        run_with_repo(async_session_factory, lambda repo: repo.get_book_by_id(book_id))
+
+
+def test_filter_books(async_session_factory):
+    filters = {"min_pages": 300, "max_pages": 400, "max_rating": 4.8}
+    result = run_with_repo(
+        async_session_factory, lambda repo: repo.filter_books(**filters)
+    )
+
+    assert [book.id for book in result] == [1]
+
+
+def test_update_book(async_session_factory, entity_book_update_data):
+    result = run_with_repo(
+        async_session_factory,
+        lambda repo: repo.update_book(1, entity_book_update_data),
+    )
+
+    assert result.title == "The Updated Title"
+
+
+def test_stream_books(async_session_factory):
+    async def collect(repo):
+        return [book.id async for book in repo.stream_books(batch_size=2)]
+
+    assert run_with_repo(async_session_factory, collect) == [1, 2, 3]
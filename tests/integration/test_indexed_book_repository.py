@@ -0,0 +1,92 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+from app.infrastructure.index.catalog_index import CatalogIndex
+from app.infrastructure.repositories.indexed_book_repository import (
+    IndexedBookRepository,
+)
+
+
+@pytest.fixture()
+def indexed_repo(sqlalchemy_repo):
+    return IndexedBookRepository(sqlalchemy_repo, CatalogIndex())
+
+
+def test_filter_books_matches_database(indexed_repo, sqlalchemy_repo):
+    filters = {"min_pages": 300, "max_pages": 400, "max_rating": 4.8}
+
+    assert indexed_repo.filter_books(**filters) == sqlalchemy_repo.filter_books(
+        **filters
+    )
+
+
+def test_filter_books_loads_index_lazily(indexed_repo):
+    assert indexed_repo.index.stale
+    result = indexed_repo.filter_books(min_price=11)
+
+    assert [book.id for book in result] == [1, 2]
+    assert len(indexed_repo.index) == 3
+
+
+def test_filter_books_title_falls_back_to_database(indexed_repo):
+    result = indexed_repo.filter_books(title="dune")
+
+    assert [book.id for book in result] == [2]
+    assert indexed_repo.index.stale
+
+
+def test_writes_keep_index_current(indexed_repo, entity_book_add):
+    indexed_repo.filter_books()
+    indexed_repo.add_book(entity_book_add)
+    indexed_repo.update_book(1, {"price": 99.0})
+    indexed_repo.delete_book(2)
+
+    assert [book.id for book in indexed_repo.filter_books(max_price=20)] == [3, 4]
+
+
+def test_reprice_marks_index_stale(indexed_repo):
+    indexed_repo.filter_books()
+    indexed_repo.reprice_books({"mode": "set", "value": 50.0}, min_pages=400)
+
+    assert [book.id for book in indexed_repo.filter_books(min_price=40)] == [2]
+
+
+def test_reprice_with_returned_rows_keeps_index_current(indexed_repo):
+    indexed_repo.filter_books()
+    indexed_repo.reprice_books(
+        {"mode": "set", "value": 50.0}, return_rows=True, min_pages=400
+    )
+
+    assert not indexed_repo.index.stale
+    assert [book.id for book in indexed_repo.filter_books(min_price=40)] == [2]
+
+
+def test_add_books_indexes_inserted_rows(indexed_repo):
+    indexed_repo.filter_books()
+    books = [
+        BookEntity(id=None, title="New", author="A", pages=10, rating=1.0, price=1.0),
+        BookEntity(id=1, title="Dup", author="A", pages=10, rating=1.0, price=1.0),
+    ]
+    results = indexed_repo.add_books(books)
+
+    assert [book.id for book in indexed_repo.filter_books(max_pages=10)] == [results[0]]
+
+
+def test_add_books_indexes_stored_values(sqlalchemy_repo):
+    repository = Mock(wraps=sqlalchemy_repo)
+    indexed_repo = IndexedBookRepository(repository, CatalogIndex())
+    indexed_repo.filter_books()
+    sent = BookEntity(id=None, title="New", author="A", pages=10, rating=1, price=9.996)
+    # what a NUMERIC(6,2) price column hands back
+    repository.get_books_by_ids = Mock(
+        side_effect=lambda ids: BookBatch.from_entities(
+            [BookEntity(**{**sent.to_dict(), "id": ids[0], "price": 10.0})]
+        )
+    )
+
+    [book_id] = indexed_repo.add_books([sent])
+
+    assert indexed_repo.index.query(min_price=10, max_price=10).tolist() == [book_id]
@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import select
+
+from app.infrastructure.database.models.book_sqla import BookORM
+from app.infrastructure.repositories.queries import apply_filters
+from tests.explain import assert_uses_index
+
+
+@pytest.mark.parametrize(
+    "filters, indexes",
+    [
+        ({"min_pages": 300}, ["ix_books_pages_id"]),
+        ({"min_pages": 300, "max_pages": 400}, ["ix_books_pages_id"]),
+        ({"max_price": 12}, ["ix_books_price_id"]),
+        ({"min_price": 5, "max_price": 12}, ["ix_books_price_id"]),
+        ({"min_rating": 4.5}, ["ix_books_rating_price", "ix_books_rating_id"]),
+        (
+            {"min_rating": 4.5, "max_price": 12},
+            ["ix_books_rating_price", "ix_books_rating_id", "ix_books_price_id"],
+        ),
+        (
+            {"min_pages": 300, "max_price": 12},
+            ["ix_books_pages_id", "ix_books_price_id"],
+        ),
+        ({"title": "dune", "search_mode": "fulltext"}, ["books_fts"]),
+    ],
+)
+def test_filter_uses_index(filled_db, filters, indexes):
+    stmt = apply_filters(select(BookORM), filters)
+
+    assert_uses_index(filled_db.connection(), stmt, *indexes)
@@ -0,0 +1,38 @@
+from sqlalchemy import create_engine, inspect
+
+from app.infrastructure.database.base import Base
+from app.infrastructure.database.migrate import applied_versions, migrate
+
+
+def test_migrate_fresh_database():
+    engine = create_engine("sqlite://")
+
+    assert migrate(engine) == [1, 2, 3, 4, 5]
+    assert migrate(engine) == []
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("books")}
+    assert {
+        "ix_books_rating_price",
+        "ix_books_price_id",
+        "ix_books_rating_id",
+        "ix_books_pages_id",
+        "ix_books_title_id",
+    } <= indexes
+    # superseded by their (key, id) versions
+    assert not {"ix_books_pages", "ix_books_price", "ix_books_title"} & indexes
+
+
+def test_migrate_up_to_target():
+    engine = create_engine("sqlite://")
+
+    migrate(engine, target=1)
+
+    assert applied_versions(engine) == {1}
+    assert inspect(engine).get_indexes("books") == []
+
+
+def test_migrate_existing_schema_is_idempotent():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+
+    assert migrate(engine) == [1, 2, 3, 4, 5]
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.infrastructure.database.pool_metrics import (
+    InstrumentedQueuePool,
+    instrument_engine,
+    pool_stats,
+)
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine(
+        "sqlite:///./test.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_pool_stats_track_in_use_and_idle(engine):
+    with engine.connect():
+        stats = pool_stats(engine)
+        assert stats["in_use"] == 1
+        assert stats["idle"] == 0
+
+    stats = pool_stats(engine)
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 1
+    assert stats["in_use_peak"] == 1
+    assert stats["checkouts"] == 1
+
+
+def test_pool_stats_count_timeouts(engine):
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine)
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.05
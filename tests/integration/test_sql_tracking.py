@@ -0,0 +1,20 @@
+from sqlalchemy import text
+
+from app.infrastructure.metrics.sql_tracking import track_queries
+
+
+def test_track_queries_counts_statements(filled_db):
+    with track_queries() as queries:
+        filled_db.execute(text("SELECT 1"))
+        filled_db.execute(text("SELECT count(*) FROM books"))
+
+    assert queries.count == 2
+    assert queries.duration > 0
+
+
+def test_queries_outside_tracking_are_ignored(filled_db):
+    with track_queries() as queries:
+        pass
+    filled_db.execute(text("SELECT 1"))
+
+    assert queries.count == 0
@@ -1,6 +1,11 @@
 import pytest
+from sqlalchemy import event, select, text
 
-from app.domain.exceptions import BookDoesntExist, BookAlreadyExists
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+from app.domain.exceptions import BookDoesntExist, BookAlreadyExists, DatabaseError
+from app.infrastructure.metrics.sql_tracking import track_queries
+from app.infrastructure.repositories.queries import BOOK_COLUMNS, order_and_paginate
 
 
 def test_get_all_books(sqlalchemy_repo):
@@ -68,3 +73,272 @@ def test_update_book_not_found(sqlalchemy_repo, entity_book_update_data):
         sqlalchemy_repo.update_book(book_id, entity_book_update_data)
 
     assert f"Book with ID={book_id} doesn't exist"
+
+
+def test_get_all_books_keyset_page(sqlalchemy_repo):
+    result = sqlalchemy_repo.get_all_books(limit=1, after_id=1)
+
+    assert [book.id for book in result] == [2]
+
+
+def test_filter_books_keyset_page(sqlalchemy_repo):
+    result = sqlalchemy_repo.filter_books(limit=5, after_id=1, min_pages=300)
+
+    assert [book.id for book in result] == [2, 3]
+
+
+def test_stream_books(sqlalchemy_repo):
+    result = sqlalchemy_repo.stream_books(batch_size=2)
+
+    assert [book.id for book in result] == [1, 2, 3]
+
+
+def test_writes_bump_catalog_version(sqlalchemy_repo, entity_book_add):
+    before = sqlalchemy_repo.version.value
+    sqlalchemy_repo.add_book(entity_book_add)
+    sqlalchemy_repo.update_book(entity_book_add.id, {"price": 1.0})
+    sqlalchemy_repo.delete_book(entity_book_add.id)
+
+    assert sqlalchemy_repo.version.value == before + 3
+
+
+def test_add_books(sqlalchemy_repo, entity_book_add):
+    duplicate = BookEntity(**entity_book_add.to_dict())
+    existing = BookEntity(**{**entity_book_add.to_dict(), "id": 1})
+    without_id = BookEntity(**{**entity_book_add.to_dict(), "id": None})
+
+    results = sqlalchemy_repo.add_books(
+        [entity_book_add, duplicate, existing, without_id], chunk_size=2
+    )
+
+    assert results[0] == entity_book_add.id
+    assert isinstance(results[1], BookAlreadyExists)
+    assert isinstance(results[2], BookAlreadyExists)
+    assert isinstance(results[3], int)
+    assert len(sqlalchemy_repo.get_all_books()) == 5
+
+
+def test_add_books_generated_ids_never_collide_with_explicit_ones(
+    sqlalchemy_repo, entity_book_add
+):
+    explicit = BookEntity(**{**entity_book_add.to_dict(), "id": 10})
+    without_id = [
+        BookEntity(**{**entity_book_add.to_dict(), "id": None}) for _ in range(3)
+    ]
+
+    results = sqlalchemy_repo.add_books([*without_id[:1], explicit, *without_id[1:]])
+
+    assert all(isinstance(result, int) for result in results)
+    assert len(set(results)) == 4
+    assert results[1] == 10
+
+
+def test_add_books_isolates_failing_rows(sqlalchemy_repo, entity_book_add):
+    invalid = BookEntity(**{**entity_book_add.to_dict(), "id": 5, "title": None})
+
+    results = sqlalchemy_repo.add_books([entity_book_add, invalid])
+
+    assert results[0] == entity_book_add.id
+    assert isinstance(results[1], DatabaseError)
+    assert len(sqlalchemy_repo.get_all_books()) == 4
+
+
+def test_reprice_books_percent(sqlalchemy_repo):
+    count, books = sqlalchemy_repo.reprice_books(
+        {"mode": "percent", "value": -10}, return_rows=True, min_pages=400
+    )
+
+    assert count == 1
+    assert [(book.id, book.price) for book in books] == [(2, 13.49)]
+    assert sqlalchemy_repo.get_book_by_id(1).price == 12.95
+
+
+def test_reprice_books_rounds_and_clamps(sqlalchemy_repo):
+    count, books = sqlalchemy_repo.reprice_books(
+        {"mode": "absolute", "value": -11, "round_to": 0.5}
+    )
+
+    assert count == 3
+    assert books is None
+    prices = {book.id: book.price for book in sqlalchemy_repo.get_all_books()}
+    assert prices == {1: 2.0, 2: 4.0, 3: 0}
+
+
+def test_filter_books_fulltext(sqlalchemy_repo, entity_book_add):
+    entity_book_add.title = "The Hobbit Companion"
+    sqlalchemy_repo.add_book(entity_book_add)
+
+    result = sqlalchemy_repo.filter_books(title="hobbit", search_mode="fulltext")
+
+    assert sorted(book.id for book in result) == [3, 4]
+
+
+def test_filter_books_fulltext_tracks_updates(sqlalchemy_repo):
+    sqlalchemy_repo.update_book(2, {"title": "Children of Dune"})
+
+    result = sqlalchemy_repo.filter_books(title="children", search_mode="fulltext")
+
+    assert [book.id for book in result] == [2]
+
+
+def test_filter_books_returns_batch(sqlalchemy_repo):
+    result = sqlalchemy_repo.filter_books(limit=1, after_id=2)
+
+    assert isinstance(result, BookBatch)
+    assert result.to_dicts() == [
+        {
+            "id": 3,
+            "title": "The Hobbit",
+            "author": "Tolkien",
+            "pages": 300,
+            "rating": 4.9,
+            "price": 10.99,
+        }
+    ]
+
+
+def test_get_books_by_ids(sqlalchemy_repo):
+    result = sqlalchemy_repo.get_books_by_ids([3, 1, 3, 100], chunk_size=1)
+
+    assert [book.id for book in result] == [1, 3]
+
+
+def test_writes_bump_row_versions(sqlalchemy_repo):
+    version = sqlalchemy_repo.version
+    untouched = version.row_version(2)
+    sqlalchemy_repo.update_book(1, {"price": 20.0})
+
+    assert version.row_version(1) == version.value
+    assert version.row_version(2) == untouched
+
+
+def test_add_book_returns_generated_id(sqlalchemy_repo, entity_book_add):
+    entity_book_add.id = None
+    result = sqlalchemy_repo.add_book(entity_book_add)
+
+    assert result.id == 4
+    assert sqlalchemy_repo.get_book_by_id(4).title == entity_book_add.title
+
+
+def test_update_book_is_a_single_statement(sqlalchemy_repo):
+    with track_queries() as queries:
+        updated = sqlalchemy_repo.update_book(1, {"price": 9.5, "unknown": 1})
+
+    assert queries.count == 1
+    assert updated.price == 9.5
+    assert updated.title == "1984"
+
+
+def test_update_book_constraint_violation(sqlalchemy_repo):
+    with pytest.raises(DatabaseError):
+        sqlalchemy_repo.update_book(1, {"title": None})
+
+    assert sqlalchemy_repo.get_book_by_id(1).title == "1984"
+
+
+def test_update_book_without_changes_returns_book(sqlalchemy_repo):
+    assert sqlalchemy_repo.update_book(2, {}).title == "Dune"
+    with pytest.raises(BookDoesntExist):
+        sqlalchemy_repo.update_book(100, {})
+
+
+def test_delete_book_is_a_single_statement(sqlalchemy_repo):
+    with track_queries() as queries:
+        sqlalchemy_repo.delete_book(1)
+
+    assert queries.count == 1
+    with pytest.raises(BookDoesntExist):
+        sqlalchemy_repo.delete_book(1)
+
+
+def test_filter_books_sorted_top_k(sqlalchemy_repo):
+    cheapest = sqlalchemy_repo.filter_books(limit=2, sort="price")
+    best_rated = sqlalchemy_repo.filter_books(limit=1, sort="-rating")
+
+    assert [book.id for book in cheapest] == [3, 1]
+    assert [book.id for book in best_rated] == [3]
+
+
+def test_filter_books_sort_ties_break_on_id(sqlalchemy_repo):
+    sqlalchemy_repo.update_book(1, {"pages": 412})
+
+    result = sqlalchemy_repo.filter_books(sort="-pages,title", min_pages=350)
+    tied = sqlalchemy_repo.filter_books(sort="-pages", min_pages=350)
+
+    assert [book.id for book in result] == [1, 2]
+    assert [book.id for book in tied] == [2, 1]
+
+
+def test_filter_books_sorted_rejects_cursor(sqlalchemy_repo):
+    with pytest.raises(ValueError):
+        sqlalchemy_repo.filter_books(limit=1, after_id=1, sort="price")
+
+
+@pytest.mark.parametrize("sort", ["-price", "price", "-rating", "pages", "title"])
+def test_sorted_top_k_reads_the_index(sqlalchemy_repo, sort):
+    stmt = order_and_paginate(select(*BOOK_COLUMNS), {"sort": sort}, 2, None)
+    sql = stmt.compile(compile_kwargs={"literal_binds": True})
+
+    plan = sqlalchemy_repo.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+
+    details = " ".join(row[-1] for row in plan)
+    assert f"ix_books_{sort.lstrip('-')}_id" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_stream_books_sorted(sqlalchemy_repo):
+    result = sqlalchemy_repo.stream_books(sort="title")
+
+    assert [book.title for book in result] == ["1984", "Dune", "The Hobbit"]
+
+
+def test_filter_books_selects_only_requested_fields(sqlalchemy_repo):
+    statements = []
+    engine = sqlalchemy_repo.session.get_bind()
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = sqlalchemy_repo.filter_books(fields=("id", "price"), sort="price")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert result.to_dicts(("id", "price")) == [
+        {"id": 3, "price": 10.99},
+        {"id": 1, "price": 12.95},
+        {"id": 2, "price": 14.99},
+    ]
+    assert "title" not in statements[0].split("FROM")[0]
+
+
+def test_get_book_statistics(sqlalchemy_repo):
+    stats = sqlalchemy_repo.get_book_statistics(buckets=2, top_authors=1)
+
+    assert stats["count"] == 3
+    assert stats["price"]["min"] == 10.99
+    assert stats["price"]["max"] == 14.99
+    assert stats["price"]["percentiles"]["p50"] == 12.95
+    assert stats["rating"]["percentiles"]["p90"] == pytest.approx(4.88)
+    assert [bucket["count"] for bucket in stats["price_histogram"]] == [2, 1]
+    assert stats["price_histogram"][-1]["upper"] == 14.99
+    assert stats["authors"] == [
+        {
+            "author": "Frank Herbert",
+            "count": 1,
+            "avg_price": 14.99,
+            "avg_rating": 4.8,
+            "min_price": 14.99,
+            "max_price": 14.99,
+        }
+    ]
+
+
+def test_get_book_statistics_applies_filters(sqlalchemy_repo):
+    stats = sqlalchemy_repo.get_book_statistics(min_price=100)
+
+    assert stats["count"] == 0
+    assert stats["price"]["percentiles"]["p50"] is None
+    assert stats["price_histogram"] == []
+    assert stats["authors"] == []
@@ -0,0 +1,60 @@
+import pytest
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+
+
+@pytest.fixture
+def batch():
+    return BookBatch.from_rows(
+        [
+            (1, "1984", "George Orwell", 328, 4.7, 12.95),
+            (2, "Animal Farm", "George Orwell", None, None, None),
+        ]
+    )
+
+
+def test_book_entity_has_no_instance_dict():
+    book = BookEntity(id=1, title="T", author="A", pages=1, price=1.0, rating=1.0)
+
+    assert not hasattr(book, "__dict__")
+    assert book.to_dict()["title"] == "T"
+
+
+def test_batch_indexing_returns_entities(batch):
+    assert len(batch) == 2
+    assert batch[0].title == "1984"
+    assert batch[-1].id == 2
+    with pytest.raises(IndexError):
+        batch[2]
+
+
+def test_batch_restores_missing_values(batch):
+    assert batch[1].to_dict() == {
+        "id": 2,
+        "title": "Animal Farm",
+        "author": "George Orwell",
+    }
+    assert batch.to_dicts()[1]["price"] is None
+
+
+def test_batch_interns_strings(batch):
+    assert batch.authors[0] is batch.authors[1]
+
+
+def test_batch_slice_and_equality(batch):
+    page = batch[:1]
+
+    assert isinstance(page, BookBatch)
+    assert page == [batch[0]]
+    assert BookBatch() == []
+
+
+def test_batch_from_projected_rows():
+    batch = BookBatch.from_rows([(1, 12.95), (2, None)], fields=("id", "price"))
+
+    assert batch.to_dicts(("id", "price")) == [
+        {"id": 1, "price": 12.95},
+        {"id": 2, "price": None},
+    ]
+    assert batch[0].title is None
@@ -27,5 +27,15 @@ def test_filter_books(book_service_mock, mock_repo):
     filters = {"min_pages": 10, "max_price": 11}
     result = book_service_mock.filter_books(**filters)
 
-    mock_repo.filter_books.assert_called_once_with(**filters)
+    mock_repo.filter_books.assert_called_once_with(
+        limit=None, after_id=None, fields=None, **filters
+    )
     assert result == expected_books
+
+
+def test_get_books_by_ids(book_service_mock, mock_repo):
+    mock_repo.get_books_by_ids.return_value = []
+    result = book_service_mock.get_books_by_ids([3, 1])
+
+    mock_repo.get_books_by_ids.assert_called_once_with([3, 1])
+    assert result == []
@@ -0,0 +1,147 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+from app.domain.exceptions import BookDoesntExist
+from app.infrastructure.cache.catalog_version import CatalogVersion
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
+from app.infrastructure.repositories.caching_book_repository import (
+    CachingBookRepository,
+)
+from app.infrastructure.repositories.queries import ID_CHUNK_SIZE
+
+
+@pytest.fixture
+def caching_repo(mock_repo):
+    return CachingBookRepository(mock_repo, LRUTTLCache(maxsize=10, ttl=60))
+
+
+def make_book(book_id=1, price=10.99):
+    return BookEntity(
+        id=book_id, title="Book", author="Author", pages=50, rating=1.0, price=price
+    )
+
+
+def test_get_book_by_id_is_read_through(caching_repo, mock_repo):
+    mock_repo.get_book_by_id.return_value = make_book()
+
+    caching_repo.get_book_by_id(1)
+    result = caching_repo.get_book_by_id(1)
+
+    mock_repo.get_book_by_id.assert_called_once_with(1)
+    assert result.id == 1
+    assert caching_repo.cache.stats()["hits"] == 1
+
+
+def test_update_book_invalidates_entry(caching_repo, mock_repo):
+    mock_repo.get_book_by_id.side_effect = [make_book(), make_book(price=5.0)]
+    caching_repo.get_book_by_id(1)
+
+    caching_repo.update_book(1, {"price": 5.0})
+    result = caching_repo.get_book_by_id(1)
+
+    assert result.price == 5.0
+    assert mock_repo.get_book_by_id.call_count == 2
+
+
+def test_delete_book_invalidates_entry(caching_repo, mock_repo):
+    mock_repo.get_book_by_id.side_effect = [make_book(), BookDoesntExist(1)]
+    caching_repo.get_book_by_id(1)
+
+    caching_repo.delete_book(1)
+
+    with pytest.raises(BookDoesntExist):
+        caching_repo.get_book_by_id(1)
+
+
+@pytest.fixture
+def filter_caching_repo(mock_repo):
+    return CachingBookRepository(
+        mock_repo,
+        LRUTTLCache(maxsize=10, ttl=60),
+        LRUTTLCache(maxsize=10, ttl=60),
+        CatalogVersion(),
+    )
+
+
+def test_filter_books_repeated_filter_skips_repository(filter_caching_repo, mock_repo):
+    mock_repo.filter_books.return_value = [make_book()]
+
+    filter_caching_repo.filter_books(min_price=5, max_price=20)
+    result = filter_caching_repo.filter_books(max_price=20, min_price=5)
+
+    mock_repo.filter_books.assert_called_once()
+    assert [book.id for book in result] == [1]
+
+
+def test_filter_books_new_catalog_version_requeries(filter_caching_repo, mock_repo):
+    mock_repo.filter_books.side_effect = [[make_book()], []]
+
+    filter_caching_repo.filter_books(min_price=5)
+    filter_caching_repo.version.bump()
+    result = filter_caching_repo.filter_books(min_price=5)
+
+    assert result == []
+    assert mock_repo.filter_books.call_count == 2
+
+
+def test_filter_books_fieldsets_are_cached_apart(filter_caching_repo, mock_repo):
+    mock_repo.filter_books.return_value = [make_book()]
+
+    filter_caching_repo.filter_books(min_price=5)
+    filter_caching_repo.filter_books(min_price=5, fields=("id", "price"))
+    filter_caching_repo.filter_books(min_price=5, fields=("id", "price"))
+
+    assert mock_repo.filter_books.call_count == 2
+
+
+def test_get_book_statistics_cached_per_catalog_version(filter_caching_repo, mock_repo):
+    mock_repo.get_book_statistics.return_value = {"count": 1}
+
+    filter_caching_repo.get_book_statistics(min_price=5)
+    filter_caching_repo.get_book_statistics(min_price=5)
+    filter_caching_repo.get_book_statistics(min_price=5, buckets=20)
+    filter_caching_repo.version.bump()
+    filter_caching_repo.get_book_statistics(min_price=5)
+
+    assert mock_repo.get_book_statistics.call_count == 3
+
+
+def test_get_books_by_ids_only_queries_uncached(caching_repo, mock_repo):
+    mock_repo.get_book_by_id.return_value = make_book(2)
+    caching_repo.get_book_by_id(2)
+    mock_repo.get_books_by_ids.return_value = BookBatch.from_entities(
+        [make_book(1), make_book(3)]
+    )
+
+    result = caching_repo.get_books_by_ids([3, 2, 1, 3])
+
+    mock_repo.get_books_by_ids.assert_called_once_with([1, 3], chunk_size=ID_CHUNK_SIZE)
+    assert [book.id for book in result] == [1, 2, 3]
+    assert caching_repo.get_books_by_ids([1, 3]) == result[::2]
+    assert mock_repo.get_books_by_ids.call_count == 1
+
+
+def test_write_during_load_does_not_cache_stale_row(mock_repo):
+    version = CatalogVersion()
+    caching_repo = CachingBookRepository(
+        mock_repo, LRUTTLCache(maxsize=10, ttl=60), version=version
+    )
+    rows = [make_book(price=10.99), make_book(price=5.0)]
+
+    def load(book_id):
+        row = rows.pop(0)
+        if row.price == 10.99:
+            # a writer commits and invalidates while the old row is in flight
+            version.bump([book_id])
+            caching_repo.update_book(book_id, {"price": 5.0})
+        return row
+
+    mock_repo.get_book_by_id.side_effect = load
+
+    assert caching_repo.get_book_by_id(1).price == 10.99
+    assert caching_repo.get_book_by_id(1).price == 5.0
+    assert caching_repo.get_book_by_id(1).price == 5.0
+    assert mock_repo.get_book_by_id.call_count == 2
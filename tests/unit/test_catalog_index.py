@@ -0,0 +1,127 @@
+import threading
+
+from app.domain.entities.book import BookEntity
+from app.domain.entities.book_batch import BookBatch
+from app.infrastructure.index.catalog_index import CatalogIndex
+
+
+def make_index():
+    index = CatalogIndex()
+    index.refresh(
+        lambda: BookBatch.from_entities(
+            [
+                BookEntity(
+                    id=1, title="a", author="x", pages=328, rating=4.7, price=12.95
+                ),
+                BookEntity(
+                    id=2, title="b", author="x", pages=412, rating=4.8, price=14.99
+                ),
+                BookEntity(
+                    id=3, title="c", author="x", pages=300, rating=4.9, price=10.99
+                ),
+                BookEntity(
+                    id=4, title="d", author="x", pages=None, rating=None, price=5.0
+                ),
+            ]
+        )
+    )
+    return index
+
+
+def test_query_without_filters_returns_all_ids_sorted():
+    assert make_index().query().tolist() == [1, 2, 3, 4]
+
+
+def test_query_combines_range_predicates():
+    result = make_index().query(min_pages=300, max_pages=400, max_rating=4.8)
+
+    assert result.tolist() == [1]
+
+
+def test_query_bounds_are_inclusive():
+    assert make_index().query(min_price=10.99, max_price=12.95).tolist() == [1, 3]
+
+
+def test_query_excludes_missing_values_from_ranges():
+    assert make_index().query(max_pages=1000).tolist() == [1, 2, 3]
+
+
+def test_query_applies_keyset_page():
+    assert make_index().query(limit=2, after_id=1).tolist() == [2, 3]
+
+
+def test_upsert_and_remove_are_visible_to_queries():
+    index = make_index()
+    index.upsert(
+        BookEntity(id=5, title="e", author="x", pages=350, price=1.0, rating=None)
+    )
+    index.remove(1)
+
+    assert index.query(min_pages=320, max_pages=400).tolist() == [5]
+
+
+def test_supports_only_range_filters():
+    assert CatalogIndex.supports({"min_price": 1, "search_mode": "substring"})
+    assert not CatalogIndex.supports({"title": "dune"})
+
+
+def test_mark_stale():
+    index = make_index()
+    assert not index.stale
+    index.mark_stale()
+
+    assert index.stale
+
+
+def test_refresh_replays_writes_made_during_the_read():
+    index = CatalogIndex()
+    snapshot = make_index()
+
+    def fetch():
+        # lands after the table was read, so the batch doesn't include it
+        index.upsert(
+            BookEntity(id=9, title="z", author="x", pages=500, price=1.0, rating=1.0)
+        )
+        index.remove(1)
+        return BookBatch.from_entities(
+            BookEntity(id=i, title="a", author="x", pages=328, price=1.0, rating=1.0)
+            for i in snapshot.query().tolist()
+        )
+
+    assert index.refresh(fetch)
+    assert index.query().tolist() == [2, 3, 4, 9]
+
+
+def test_refresh_stays_stale_when_marked_during_the_read():
+    index = CatalogIndex()
+
+    def fetch():
+        index.mark_stale()
+        return BookBatch()
+
+    assert not index.refresh(fetch)
+    assert index.stale
+
+
+def test_refresh_is_single_flight():
+    index = CatalogIndex()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return BookBatch()
+
+    loader = threading.Thread(target=index.refresh, args=(fetch,))
+    loader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=index.refresh, args=(fetch,))
+    waiter.start()
+    release.set()
+    loader.join(5)
+    waiter.join(5)
+
+    assert len(calls) == 1
+    assert not index.stale
@@ -0,0 +1,30 @@
+from app.infrastructure.cache.catalog_version import CatalogVersion
+
+
+def test_bump_with_ids_only_changes_those_rows():
+    version = CatalogVersion()
+    version.bump([1])
+
+    assert version.value == 1
+    assert version.row_version(1) == 1
+    assert version.row_version(2) == 0
+
+
+def test_bump_without_ids_changes_every_row():
+    version = CatalogVersion()
+    version.bump([1])
+    version.bump()
+
+    assert version.row_version(1) == 2
+    assert version.row_version(2) == 2
+
+
+def test_evicted_rows_fall_back_to_the_floor():
+    version = CatalogVersion(max_tracked_rows=2)
+    version.bump([1])
+    version.bump([2])
+    version.bump([3])
+
+    assert version.row_version(1) == 1
+    assert version.row_version(2) == 2
+    assert version.row_version(4) == 1
@@ -0,0 +1,67 @@
+import gzip
+
+import pytest
+from fastapi import Response
+
+from app.api.compression import (
+    COMPRESSORS,
+    IDENTITY,
+    negotiate_encoding,
+    snapshot_response,
+)
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, IDENTITY),
+        ("", IDENTITY),
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0, deflate", IDENTITY),
+        ("br", IDENTITY),
+        ("identity", IDENTITY),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+@pytest.mark.skipif("zstd" not in COMPRESSORS, reason="zstandard not installed")
+def test_negotiate_prefers_zstd_unless_weighted_lower():
+    assert negotiate_encoding("gzip, zstd") == "zstd"
+    assert negotiate_encoding("*") == "zstd"
+    assert negotiate_encoding("zstd;q=0.5, gzip") == "gzip"
+
+
+def test_snapshot_response_compresses_once():
+    snapshots = LRUTTLCache(maxsize=10, ttl=60)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return Response(b'[{"id":1}]' * 100, media_type="application/json")
+
+    first = snapshot_response(snapshots, "key", "gzip", build)
+    second = snapshot_response(snapshots, "key", "gzip", build)
+
+    assert len(builds) == 1
+    assert first.body == second.body
+    assert gzip.decompress(second.body) == b'[{"id":1}]' * 100
+    assert second.headers["content-encoding"] == "gzip"
+    assert second.headers["content-type"] == "application/json"
+    assert second.headers["content-length"] == str(len(second.body))
+
+
+def test_snapshot_response_identity_is_not_stored():
+    snapshots = LRUTTLCache(maxsize=10, ttl=60)
+    response = snapshot_response(
+        snapshots,
+        "key",
+        IDENTITY,
+        lambda: Response(b"[]", media_type="application/json"),
+    )
+
+    assert response.body == b"[]"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(snapshots) == 0
@@ -0,0 +1,32 @@
+from app.config import Settings
+
+
+def test_from_env_defaults(monkeypatch):
+    for name in ("DATABASE_URL", "ASYNC_DATABASE_URL", "DB_POOL_SIZE"):
+        monkeypatch.delenv(name, raising=False)
+    settings = Settings.from_env()
+
+    assert settings == Settings()
+    assert settings.async_database_url.startswith("postgresql+asyncpg://")
+
+
+def test_from_env_reads_pool_settings(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgres://user:pw@host:5432/books")
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    settings = Settings.from_env()
+
+    assert settings.database_url == "postgresql://user:pw@host:5432/books"
+    assert settings.async_database_url == "postgresql+asyncpg://user:pw@host:5432/books"
+    assert settings.db_pool_size == 20
+    assert settings.db_pool_timeout == 2.5
+    assert settings.db_pool_pre_ping is False
+
+
+def test_from_env_sqlite_uses_aiosqlite(monkeypatch):
+    monkeypatch.delenv("ASYNC_DATABASE_URL", raising=False)
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///./books.db")
+    settings = Settings.from_env()
+
+    assert settings.async_database_url == "sqlite+aiosqlite:///./books.db"
@@ -0,0 +1,24 @@
+from unittest.mock import Mock
+
+from app.infrastructure.database.id_allocator import SequenceIdAllocator
+
+
+def make_session(dialect="postgresql"):
+    session = Mock()
+    session.get_bind.return_value.dialect.name = dialect
+    return session
+
+
+def test_advance_past_moves_the_sequence():
+    session = make_session()
+
+    SequenceIdAllocator().advance_past(session, 42)
+
+    assert session.execute.call_args.args[1] == {"book_id": 42}
+
+
+def test_supports_only_sequence_dialects():
+    allocator = SequenceIdAllocator()
+
+    assert allocator.supports(make_session("postgresql"))
+    assert not allocator.supports(make_session("sqlite"))
@@ -0,0 +1,66 @@
+from app.infrastructure.cache.lru_ttl_cache import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_counts_hits_and_misses():
+    cache = LRUTTLCache(maxsize=2, ttl=10)
+    cache.set(1, "a")
+
+    assert cache.get(1) == "a"
+    assert cache.get(2) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used():
+    cache = LRUTTLCache(maxsize=2, ttl=10)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUTTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set(1, "a")
+    clock.now = 10
+
+    assert cache.get(1) is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_weighted_cache_evicts_to_stay_under_max_weight():
+    cache = LRUTTLCache(maxsize=10, ttl=10, max_weight=10, weigh=len)
+    cache.set(1, "aaaa")
+    cache.set(2, "bbbb")
+    cache.set(3, "cccc")
+
+    assert cache.get(1) is None
+    assert cache.weight == 8
+    assert cache.stats()["evictions"] == 1
+
+    cache.set(2, "bb")
+    cache.invalidate(3)
+    assert cache.weight == 2
+
+
+def test_weighted_cache_skips_values_over_max_weight():
+    cache = LRUTTLCache(maxsize=10, ttl=10, max_weight=10, weigh=len)
+    cache.set(1, "a")
+    cache.set(2, "x" * 11)
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
@@ -0,0 +1,98 @@
+import pytest
+
+from app.infrastructure.metrics.registry import (
+    CallbackCounter,
+    CallbackGauge,
+    Counter,
+    Gauge,
+    Histogram,
+    Metric,
+    MetricsRegistry,
+)
+
+
+@pytest.fixture()
+def registry():
+    return MetricsRegistry()
+
+
+def test_counter_exposition(registry):
+    counter = registry.register(Counter("jobs", "Jobs run", ("kind",)))
+    counter.inc("import")
+    counter.inc("import", amount=2)
+
+    assert registry.render() == (
+        "# HELP jobs Jobs run\n" "# TYPE jobs counter\n" 'jobs_total{kind="import"} 3\n'
+    )
+
+
+def test_gauge_exposition(registry):
+    gauge = registry.register(Gauge("in_flight", "In flight", ("route",)))
+    gauge.inc("/books")
+    gauge.inc("/books")
+    gauge.dec("/books")
+    gauge.set("/", value=0.5)
+
+    assert registry.render().splitlines()[2:] == [
+        'in_flight{route="/"} 0.5',
+        'in_flight{route="/books"} 1',
+    ]
+
+
+def test_histogram_exposition_is_cumulative(registry):
+    histogram = registry.register(
+        Histogram("latency", "Latency", ("route",), buckets=(0.1, 1.0))
+    )
+    histogram.observe("/books", value=0.05)
+    histogram.observe("/books", value=0.1)
+    histogram.observe("/books", value=3.0)
+
+    assert registry.render().splitlines() == [
+        "# HELP latency Latency",
+        "# TYPE latency histogram",
+        'latency_bucket{route="/books",le="0.1"} 2',
+        'latency_bucket{route="/books",le="1"} 2',
+        'latency_bucket{route="/books",le="+Inf"} 3',
+        'latency_sum{route="/books"} 3.15',
+        'latency_count{route="/books"} 3',
+    ]
+
+
+def test_label_values_are_escaped(registry):
+    gauge = registry.register(Gauge("g", "Help", ("value",)))
+    gauge.set('a"b\\c\nd', value=1)
+
+    assert 'g{value="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_callback_gauge_reads_values_at_render(registry):
+    values = {("sync",): 1}
+    registry.register(CallbackGauge("pool", "Pool", ("engine",), lambda: values))
+    values[("sync",)] = 4
+
+    assert 'pool{engine="sync"} 4' in registry.render()
+
+
+def test_register_rejects_duplicate_names(registry):
+    registry.register(Gauge("g", "Help"))
+    with pytest.raises(ValueError):
+        registry.register(Gauge("g", "Help"))
+
+
+def test_callback_counter_exposition(registry):
+    registry.register(
+        CallbackCounter("timeouts", "Timeouts", ("engine",), lambda: {("sync",): 2})
+    )
+
+    assert registry.render().splitlines()[1:] == [
+        "# TYPE timeouts counter",
+        'timeouts_total{engine="sync"} 2',
+    ]
+
+
+def test_metric_without_samples_cannot_be_created():
+    class Incomplete(Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete("m", "Help")
@@ -0,0 +1,43 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.profiling.profilers import StackSampler
+
+
+def test_sample_collapses_relevant_stacks():
+    sampler = StackSampler(packages=(__file__,))
+    sampler.sample(sys._getframe())
+    sampler.sample(sys._getframe())
+
+    [(stack, count)] = sampler.stacks.items()
+    assert stack.endswith(f"{__name__}:test_sample_collapses_relevant_stacks")
+    assert count == 2
+
+
+def test_sample_skips_unrelated_stacks():
+    sampler = StackSampler(packages=("/nowhere/",))
+    sampler.sample(sys._getframe())
+
+    assert not sampler.stacks
+
+
+def test_write_collapsed_format(tmp_path):
+    sampler = StackSampler()
+    sampler.stacks.update({"a:main;b:work": 3, "a:main": 1})
+    sampler.write(str(tmp_path / "out.collapsed"))
+
+    assert (tmp_path / "out.collapsed").read_text() == "a:main;b:work 3\na:main 1\n"
+
+
+@pytest.mark.parametrize("profiled", [True, False])
+def test_sampler_only_samples_profiled_threads(profiled):
+    threads = {threading.get_ident()} if profiled else set()
+    sampler = StackSampler(interval=0.0005, packages=(__file__,), threads=threads)
+    sampler.start()
+    time.sleep(0.02)
+    sampler.stop()
+
+    assert bool(sampler.stacks) is profiled
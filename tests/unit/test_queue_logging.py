@@ -0,0 +1,92 @@
+import logging
+import threading
+
+import pytest
+
+from app.domain.entities.book_batch import BookBatch
+from app.infrastructure.log.queue_logging import (
+    BookSummary,
+    RouteSampler,
+    configure_logging,
+    current_route,
+    parse_sample_rates,
+)
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.getMessage(), threading.current_thread()))
+
+
+@pytest.fixture()
+def recording():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    handler = RecordingHandler()
+    yield handler
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def make_record(level=logging.INFO):
+    return logging.LogRecord("app", level, __file__, 1, "message", None, None)
+
+
+def test_route_sampler_applies_route_rate():
+    sampler = RouteSampler({"GET /books": 0.0}, default_rate=1.0)
+    token = current_route.set("GET /books")
+    try:
+        assert not sampler.filter(make_record())
+        assert sampler.filter(make_record(logging.WARNING))
+    finally:
+        current_route.reset(token)
+    assert sampler.filter(make_record())
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("GET /books=0.1, GET /=0.01,") == {
+        "GET /books": 0.1,
+        "GET /": 0.01,
+    }
+
+
+def test_book_summary_truncates_ids():
+    books = BookBatch.from_rows((i, "t", "a", 1, 1.0, 1.0) for i in range(1, 13))
+
+    assert str(BookSummary(books, max_ids=3)) == "12 rows, ids=[1, 2, 3, ... +9 more]"
+    assert str(BookSummary(books[:2])) == "2 rows, ids=[1, 2]"
+
+
+def test_configure_logging_emits_off_the_calling_thread(recording):
+    listener = configure_logging("INFO", handler=recording)
+    logging.getLogger("app.test").info("created %s", 42)
+    logging.getLogger("app.test").debug("hidden")
+    listener.stop()
+
+    [(message, thread)] = recording.records
+    assert message == "created 42"
+    assert thread is not threading.current_thread()
+
+
+def test_configure_logging_formats_on_the_listener_thread(recording):
+    formatted_on = []
+
+    class Lazy:
+        def __str__(self):
+            formatted_on.append(threading.current_thread())
+            return "lazy"
+
+    # pytest's capture handlers would format the record on this thread too
+    logging.getLogger().handlers.clear()
+    listener = configure_logging("INFO", handler=recording)
+    logging.getLogger("app.test").info("value %s", Lazy())
+    listener.stop()
+
+    [(message, thread)] = recording.records
+    assert message == "value lazy"
+    assert formatted_on == [thread]
+    assert thread is not threading.current_thread()
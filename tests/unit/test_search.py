@@ -0,0 +1,29 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.infrastructure.database.models.book_sqla import BookORM
+from app.infrastructure.database.search import TitleMatches, TitleRank, fts5_query
+
+
+def compile_sql(stmt, dialect):
+    return str(stmt.compile(dialect=dialect))
+
+
+def test_fts5_query_quotes_words():
+    assert fts5_query('lord "of" the-rings*') == '"lord" "of" "the" "rings"'
+
+
+def test_title_matches_postgresql_uses_tsvector_index_expression():
+    stmt = select(BookORM.id).where(TitleMatches("dune"))
+
+    sql = compile_sql(stmt, postgresql.dialect())
+
+    assert "to_tsvector('english', books.title) @@ websearch_to_tsquery" in sql
+
+
+def test_title_rank_sqlite_uses_fts5():
+    stmt = select(BookORM.id).order_by(TitleRank("dune").desc())
+
+    sql = compile_sql(stmt, sqlite.dialect())
+
+    assert "bm25(books_fts)" in sql
@@ -0,0 +1,42 @@
+import asyncio
+from unittest.mock import Mock
+
+from app.infrastructure.metrics.app_metrics import REPOSITORY_LATENCY
+from app.infrastructure.repositories.timed_book_repository import (
+    TimedBookRepository,
+)
+
+
+class AsyncRepository:
+    async def get_book_by_id(self, book_id):
+        return book_id
+
+
+def test_sync_calls_are_forwarded_and_timed(mock_repo):
+    before = REPOSITORY_LATENCY.count("mock", "get_all_books")
+    mock_repo.get_all_books.return_value = []
+    repository = TimedBookRepository(mock_repo, name="mock")
+
+    assert repository.get_all_books(limit=1) == []
+    mock_repo.get_all_books.assert_called_once_with(limit=1)
+    assert REPOSITORY_LATENCY.count("mock", "get_all_books") == before + 1
+
+
+def test_failed_calls_are_timed(mock_repo):
+    before = REPOSITORY_LATENCY.count("mock", "delete_book")
+    mock_repo.delete_book.side_effect = KeyError
+    repository = TimedBookRepository(mock_repo, name="mock")
+
+    try:
+        repository.delete_book(1)
+    except KeyError:
+        pass
+    assert REPOSITORY_LATENCY.count("mock", "delete_book") == before + 1
+
+
+def test_async_calls_are_awaited_and_timed():
+    before = REPOSITORY_LATENCY.count("AsyncRepository", "get_book_by_id")
+    repository = TimedBookRepository(AsyncRepository())
+
+    assert asyncio.run(repository.get_book_by_id(7)) == 7
+    assert REPOSITORY_LATENCY.count("AsyncRepository", "get_book_by_id") == before + 1